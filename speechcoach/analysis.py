@@ -1,45 +1,114 @@
-from typing import Any, Dict, List, Optional, Tuple
+import math
+import os
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 try:
     import numpy as np
 except Exception:
     np = None
 
-try:
-    import librosa
-except Exception:
-    librosa = None
+# librosa is imported on first use (see _get_librosa): it pulls numba/scipy and
+# costs seconds at startup. warmup() can preload it off the UI thread.
+_librosa = None
 
 from .config import DEFAULT_SAMPLE_RATE
 from .utils_text import normalize_text_fr
 
 import soundfile as sf
 
+def _get_librosa():
+    global _librosa
+    if _librosa is None:
+        try:
+            import librosa as _mod
+        except Exception:
+            _mod = False
+        _librosa = _mod
+    return _librosa or None
+
+def warmup() -> None:
+    """Import librosa and run the feature pipeline once on silence (JIT/filterbank warm-up)."""
+    if np is None or _get_librosa() is None:
+        return
+    try:
+        _spectral_features(np.zeros(DEFAULT_SAMPLE_RATE // 4, dtype=np.float32), DEFAULT_SAMPLE_RATE)
+    except Exception:
+        pass
+
 def clamp(x, a, b):
     return max(a, min(b, x))
 
 def cosine_similarity(a: "np.ndarray", b: "np.ndarray") -> float:
-    denom = (np.linalg.norm(a) * np.linalg.norm(b)) + 1e-9
-    return float(np.dot(a, b) / denom)
+    # Three dot products, one sqrt: cheaper than two linalg.norm calls for ~17-dim vectors.
+    denom = math.sqrt(float(a @ a) * float(b @ b)) + 1e-9
+    return float(a @ b) / denom
 
-def load_audio_strict(wav_path, target_sr):
-    y, sr = sf.read(wav_path, dtype="float32", always_2d=False)
+# Small (path, target_sr) -> (mtime, y, sr) cache: a round's WAV is typically
+# decoded more than once (analysis, replay, reference capture).
+_AUDIO_CACHE: "OrderedDict[Tuple[str, int], Tuple[float, Any, int]]" = OrderedDict()
+_AUDIO_CACHE_MAX = 8
+# Used from the game worker, the UI thread and the golden runner.
+_AUDIO_CACHE_LOCK = threading.Lock()
 
-    # mono
-    if getattr(y, "ndim", 1) > 1:
-        y = np.mean(y, axis=1).astype("float32")
+def load_audio_strict(wav_path, target_sr):
+    """Read a WAV as mono float32 at `target_sr`.
+
+    The returned array is shared with the cache and marked read-only.
+    """
+    try:
+        mtime = os.path.getmtime(wav_path)
+    except OSError:
+        mtime = None
+    key = (str(wav_path), int(target_sr))
+    with _AUDIO_CACHE_LOCK:
+        hit = _AUDIO_CACHE.get(key)
+        if hit is not None and mtime is not None and hit[0] == mtime:
+            _AUDIO_CACHE.move_to_end(key)
+            return hit[1], hit[2]
 
-    # resample si nécessaire
-    if sr != target_sr:
-        y = librosa.resample(y, orig_sr=sr, target_sr=target_sr).astype("float32")
-        sr = target_sr
+    y, sr = sf.read(wav_path, dtype="float32", always_2d=False)
 
+    # Fast path: recordings are already mono float32 at the target rate.
+    if not (sr == target_sr and y.ndim == 1):
+        # mono
+        if getattr(y, "ndim", 1) > 1:
+            y = np.mean(y, axis=1).astype("float32")
+
+        # resample si nécessaire
+        if sr != target_sr:
+            y = _get_librosa().resample(y, orig_sr=sr, target_sr=target_sr).astype("float32")
+            sr = target_sr
+
+    if mtime is not None:
+        y.flags.writeable = False
+        with _AUDIO_CACHE_LOCK:
+            _AUDIO_CACHE[key] = (mtime, y, sr)
+            while len(_AUDIO_CACHE) > _AUDIO_CACHE_MAX:
+                _AUDIO_CACHE.popitem(last=False)
     return y, sr
 
 def extract_features(wav_path: str, start_sec: float = 0.0, end_sec: Optional[float] = None) -> Dict[str, Any]:
-    if np is None or librosa is None:
+    if np is None or _get_librosa() is None:
         return {}
     y, sr = load_audio_strict(wav_path, DEFAULT_SAMPLE_RATE)
+    return extract_features_from_array(y, sr, start_sec, end_sec)
+
+def extract_features_from_array(
+    y: Union["np.ndarray", List["np.ndarray"]], sr: int, start_sec: float = 0.0, end_sec: Optional[float] = None
+) -> Dict[str, Any]:
+    """Same as extract_features, on mono float32 samples already in memory.
+
+    `y` may also be the list of blocks produced while recording.
+    """
+    if np is None or _get_librosa() is None:
+        return {}
+    if isinstance(y, (list, tuple)):
+        if not y:
+            return {}
+        y = np.concatenate(y)
 
     if end_sec is None:
         end_sec = len(y) / sr
@@ -49,12 +118,29 @@ def extract_features(wav_path: str, start_sec: float = 0.0, end_sec: Optional[fl
     if len(y) < int(0.08 * sr):
         return {}
 
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-    mfcc_mean = np.mean(mfcc, axis=1)
+    return _spectral_features(y, sr)
+
+# Kept at 13: stored reference profiles and session features use this layout.
+N_MFCC = 13
+
+def _spectral_features(y: "np.ndarray", sr: int) -> Dict[str, Any]:
+    librosa = _get_librosa()
+    import scipy.fft as scipy_fft  # librosa dependency, loaded with it
+    # One STFT shared by the spectral features (librosa defaults: n_fft=2048, hop=512).
+    n_fft = 2048
+    S = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=512))
+    mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr)
+    # The DCT is linear, so mean_t(DCT(log-mel)) == DCT(mean_t(log-mel)): transform the
+    # time-averaged log-mel once instead of every frame (same values as
+    # librosa.feature.mfcc: DCT-II, ortho norm, no lifter).
+    log_mel_mean = np.mean(librosa.power_to_db(mel), axis=1)
+    mfcc_mean = scipy_fft.dct(log_mel_mean, type=2, norm="ortho")[:N_MFCC]
     zcr = float(np.mean(librosa.feature.zero_crossing_rate(y)))
-    rms = float(np.mean(librosa.feature.rms(y=y)))
-    centroid = float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
-    rolloff = float(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
+    # Time-domain RMS as before: rms(S=...) works on the Hann-windowed spectrum and
+    # comes out ~0.6x lower, which would shift every stored reference profile.
+    rms = float(np.mean(librosa.feature.rms(y=y, frame_length=n_fft, hop_length=512)))
+    centroid = float(np.mean(librosa.feature.spectral_centroid(S=S, sr=sr)))
+    rolloff = float(np.mean(librosa.feature.spectral_rolloff(S=S, sr=sr)))
 
     return {
         "mfcc_mean": mfcc_mean.tolist(),
@@ -66,27 +152,34 @@ def extract_features(wav_path: str, start_sec: float = 0.0, end_sec: Optional[fl
         "dur_sec": len(y)/float(sr),
     }
 
+_SCALAR_FEATURES = ("zcr", "rms", "centroid", "rolloff")
+
 def vectorize_features(feat: Dict[str, Any]) -> Optional["np.ndarray"]:
     if np is None or not feat:
         return None
-    v = []
     mm = feat.get("mfcc_mean", [])
-    if isinstance(mm, list) and mm:
-        v.extend([float(x) for x in mm])
-    for k in ["zcr", "rms", "centroid", "rolloff"]:
-        if k in feat:
-            v.append(float(feat[k]))
-    if not v:
+    if not isinstance(mm, (list, tuple, np.ndarray)):
+        mm = []
+    scalars = [feat[k] for k in _SCALAR_FEATURES if k in feat]
+    n = len(mm) + len(scalars)
+    if not n:
         return None
-    arr = np.array(v, dtype=np.float32)
-    arr = (arr - np.mean(arr)) / (np.std(arr) + 1e-6)
+    # Single pass into a float32 buffer, then in-place z-normalization.
+    arr = np.fromiter(chain(mm, scalars), dtype=np.float32, count=n)
+    arr -= arr.mean()
+    arr /= (arr.std() + 1e-6)
     return arr
 
-def acoustic_score_from_features(feat: Dict[str, Any], ref: Dict[str, Any]) -> float:
+def acoustic_score_from_features(feat: Dict[str, Any], ref: Union[Dict[str, Any], "np.ndarray"]) -> float:
+    """Cosine similarity between `feat` and a reference profile.
+
+    `ref` may be a raw profile dict or an already vectorized array
+    (see `vectorize_features`), which lets callers vectorize a reference once.
+    """
     if np is None:
         return 0.0
     a = vectorize_features(feat)
-    b = vectorize_features(ref)
+    b = ref if isinstance(ref, np.ndarray) else vectorize_features(ref)
     if a is None or b is None:
         return 0.0
     return cosine_similarity(a, b)
@@ -1,43 +1,110 @@
+import os
+import queue
 import threading
-from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import ASR_MODEL_CACHE_SIZE
 
 try:
-    from faster_whisper import WhisperModel
+    import numpy as np
 except Exception:
-    WhisperModel = None
+    np = None
+
+# faster_whisper (ctranslate2) is imported on first model load, not at import time.
+WhisperModel = None
+
+def _whisper_model_cls():
+    global WhisperModel
+    if WhisperModel is None:
+        try:
+            from faster_whisper import WhisperModel as _cls
+        except Exception:
+            _cls = False
+        WhisperModel = _cls
+    return WhisperModel or None
+
+def _asr_cpu_threads() -> int:
+    # Segments are transcribed while the microphone stream is live (see
+    # StreamingTranscriber): leave one core to the audio capture.
+    return max(1, (os.cpu_count() or 2) - 1)
 
 class ASREngine:
     """Whisper local (faster-whisper)"""
+
+    # Process-wide LRU of loaded models, keyed by (model_size, device, compute_type),
+    # shared by every ASREngine. Switching back to a previously used size is then
+    # instant (no reload).
+    _MODEL_CACHE: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+    _MODEL_CACHE_MAX = max(1, int(ASR_MODEL_CACHE_SIZE))
+    _cache_lock = threading.Lock()
+
     def __init__(self, model_size: str = "small"):
         self.model_size = model_size
         self.device = "cpu"
         self.compute_type = "int8"
-        self._model = None
         self._lock = threading.Lock()
 
+    def warmup(self) -> None:
+        """Load the model now so the first transcription isn't cold (run off the UI thread)."""
+        self._ensure_model()
+
     def set_model(self, size: str):
-        self.model_size = size
         with self._lock:
-            self._model = None
+            self.model_size = size
+
+    def _cache_key(self) -> Tuple[str, str, str]:
+        with self._lock:
+            return (self.model_size, self.device, self.compute_type)
 
     def _ensure_model(self):
-        if WhisperModel is None:
+        model_cls = _whisper_model_cls()
+        if model_cls is None:
             return None
-        with self._lock:
-            if self._model is None:
-                try:
-                    self._model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type)
-                except Exception:
-                    self._model = None
-            return self._model
+        key = self._cache_key()
+        cache = ASREngine._MODEL_CACHE
+        with ASREngine._cache_lock:
+            model = cache.get(key)
+            if model is not None:
+                cache.move_to_end(key)
+                return model
+            # Evict before loading, so the cache never holds more than _MODEL_CACHE_MAX.
+            while len(cache) >= ASREngine._MODEL_CACHE_MAX:
+                cache.popitem(last=False)
+            try:
+                model = model_cls(
+                    key[0],
+                    device=key[1],
+                    compute_type=key[2],
+                    cpu_threads=_asr_cpu_threads(),
+                    num_workers=1,
+                )
+            except Exception:
+                return None
+            cache[key] = model
+            return model
 
     def transcribe_words(self, wav_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        return self._transcribe(wav_path)
+
+    def transcribe_array(
+        self, audio: "np.ndarray", offset_sec: float = 0.0, prompt: Optional[str] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Transcribe a mono float32 buffer at 16 kHz (no WAV round-trip).
+
+        Word timestamps are shifted by `offset_sec` so that segments of the same
+        recording can be merged.
+        """
+        return self._transcribe(audio, offset_sec=offset_sec, prompt=prompt)
+
+    def _transcribe(self, source, offset_sec: float = 0.0, prompt: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
         model = self._ensure_model()
         if model is None:
             return "", []
         try:
             segments, _info = model.transcribe(
-                wav_path, language="fr", word_timestamps=True, vad_filter=True, beam_size=5
+                source, language="fr", word_timestamps=True, vad_filter=True, beam_size=5,
+                initial_prompt=prompt or None,
             )
             words = []
             texts = []
@@ -48,9 +115,84 @@ class ASREngine:
                     for w in seg.words:
                         words.append({
                             "word": (getattr(w, "word", "") or "").strip(),
-                            "start": float(getattr(w, "start", 0.0) or 0.0),
-                            "end": float(getattr(w, "end", 0.0) or 0.0),
+                            "start": float(getattr(w, "start", 0.0) or 0.0) + offset_sec,
+                            "end": float(getattr(w, "end", 0.0) or 0.0) + offset_sec,
                         })
             return " ".join(texts).strip(), words
         except Exception:
             return "", []
+
+
+class StreamingTranscriber:
+    """Transcribe a recording segment by segment while it is being captured.
+
+    Feed it the recorder blocks (`feed`); each time a silent block closes a
+    segment of at least `min_segment_sec`, the segment is handed to a worker
+    thread. `finish()` flushes the tail and returns the merged (text, words),
+    so only the last segment is transcribed after the child stops speaking.
+    """
+
+    def __init__(self, asr: ASREngine, sample_rate: int, min_segment_sec: float = 2.0):
+        self.asr = asr
+        self.sample_rate = int(sample_rate)
+        self._min_samples = int(min_segment_sec * self.sample_rate)
+        self._pending: List["np.ndarray"] = []
+        self._pending_n = 0
+        self._submitted_n = 0
+        self._texts: List[str] = []
+        self._words: List[Dict[str, Any]] = []
+        self._cancelled = False
+        self._q: "queue.Queue[Optional[Tuple[np.ndarray, float]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def feed(self, chunk: "np.ndarray", is_speech: bool) -> None:
+        self._pending.append(chunk)
+        self._pending_n += int(chunk.size)
+        # Cut only on silence so words are never split across segments.
+        if not is_speech and self._pending_n >= self._min_samples:
+            self._submit()
+
+    def _submit(self) -> None:
+        if not self._pending or np is None:
+            return
+        audio = np.concatenate(self._pending).astype(np.float32, copy=False)
+        self._q.put((audio, self._submitted_n / float(self.sample_rate)))
+        self._submitted_n += self._pending_n
+        self._pending = []
+        self._pending_n = 0
+
+    def _loop(self) -> None:
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            if self._cancelled:
+                continue
+            audio, offset = item
+            text, words = self.asr.transcribe_array(audio, offset_sec=offset, prompt=" ".join(self._texts))
+            if self._cancelled:
+                continue
+            if text:
+                self._texts.append(text)
+            self._words.extend(words)
+
+    @property
+    def submitted(self) -> bool:
+        """True once some audio was handed to the worker (see finish)."""
+        return self._submitted_n > 0
+
+    def finish(self) -> Tuple[str, List[Dict[str, Any]]]:
+        self._submit()
+        self._q.put(None)
+        self._thread.join()
+        return " ".join(self._texts).strip(), list(self._words)
+
+    def cancel(self) -> None:
+        """Drop this recording. Waits for a segment already in Whisper, so it
+        doesn't compete with the next attempt's worker."""
+        self._cancelled = True
+        self._pending = []
+        self._q.put(None)
+        if self._thread is not threading.current_thread():
+            self._thread.join()
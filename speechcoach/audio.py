@@ -1,6 +1,9 @@
+import logging
+import math
 import os
 import threading
-from typing import List, Optional, Tuple
+import time
+from typing import Callable, List, Optional, Tuple
 
 try:
     import numpy as np
@@ -21,6 +24,8 @@ from .config import DEFAULT_SAMPLE_RATE
 from .utils_paths import ensure_dir
 from .tts import TTSEngine
 
+logger = logging.getLogger(__name__)
+
 class AudioEngine:
     """Audio record/play + devices + TTS wrapper."""
     def __init__(self):
@@ -28,6 +33,7 @@ class AudioEngine:
         self.tts = TTSEngine()
         self.input_device: Optional[int] = None
         self.output_device: Optional[int] = None
+        self._devices_cache: Optional[Tuple[float, list]] = None
 
         if sd is not None:
             try:
@@ -50,11 +56,24 @@ class AudioEngine:
             return self.play(path)
         raise AttributeError("No playback method available (play_wav/play_audio_path/play).")
 
+    # sd.query_devices() probes PortAudio: share one short-lived snapshot between
+    # the input and output lists (UI dropdown refreshes call both).
+    _DEVICES_TTL_SEC = 5.0
+
+    def _query_devices(self) -> list:
+        now = time.monotonic()
+        cached = self._devices_cache
+        if cached is not None and now - cached[0] < self._DEVICES_TTL_SEC:
+            return cached[1]
+        devices = list(sd.query_devices())
+        self._devices_cache = (now, devices)
+        return devices
+
     def list_input_devices(self) -> List[Tuple[int, str]]:
         if sd is None:
             return []
         out = []
-        for i, d in enumerate(sd.query_devices()):
+        for i, d in enumerate(self._query_devices()):
             if d.get("max_input_channels", 0) > 0:
                 out.append((i, d.get("name", f"device {i}")))
         return out
@@ -63,7 +82,7 @@ class AudioEngine:
         if sd is None:
             return []
         out = []
-        for i, d in enumerate(sd.query_devices()):
+        for i, d in enumerate(self._query_devices()):
             if d.get("max_output_channels", 0) > 0:
                 out.append((i, d.get("name", f"device {i}")))
         return out
@@ -71,6 +90,7 @@ class AudioEngine:
     def set_devices(self, input_dev: Optional[int], output_dev: Optional[int]):
         self.input_device = input_dev
         self.output_device = output_dev
+        self._devices_cache = None
         if sd is None:
             return
         try:
@@ -114,11 +134,17 @@ class AudioEngine:
         threshold_mult: float = 3.0,
         min_total_sec: float = 1.2,
         min_speech_sec: float = 0.6,
+        on_chunk: Optional[Callable[["np.ndarray", bool], None]] = None,
     ) -> Tuple[float, float]:
+        """Record until trailing silence and write the take to `out_path`.
+
+        `on_chunk(block, is_speech)` is called for every kept block, so a consumer
+        (e.g. StreamingTranscriber) can process the audio while recording goes on.
+        """
         ensure_dir(os.path.dirname(out_path) or ".")
         if sd is None or sf is None or np is None:
             if sf is not None and np is not None:
-                sf.write(out_path, np.zeros(int(self.sample_rate * 0.2), dtype=np.float32), self.sample_rate)
+                sf.write(out_path, np.zeros(int(self.sample_rate * 0.2), dtype=np.float32), self.sample_rate, subtype="PCM_16")
             return 0.2, 0.0
 
         if self.input_device is None:
@@ -133,43 +159,66 @@ class AudioEngine:
         min_speech = int(min_speech_sec / block_sec)
         calib = max(1, int(calibrate_sec / block_sec))
 
-        frames = []
+        # Kept blocks are streamed to disk as 16-bit PCM (half the size of float32)
+        # instead of being accumulated in memory.
+        kept = 0
         started = False
         silent = 0
         speech = 0
         total = 0
+        overflows = 0
 
-        def rms(x):
-            return float(np.sqrt(np.mean(x * x))) if x.size else 0.0
+        def energy(x):
+            return float(x @ x) / x.size if x.size else 0.0
 
+        # VAD on mean energy (no sqrt) with hysteresis: onset on the raw block
+        # energy, end-of-speech on a smoothed (EMA) energy so short dips between
+        # words don't count as silence.
         noise = []
-        with sd.InputStream(samplerate=sr, channels=1, dtype="float32", device=self.input_device) as stream:
+        with sf.SoundFile(out_path, "w", samplerate=sr, channels=1, subtype="PCM_16") as out, \
+                sd.InputStream(samplerate=sr, channels=1, dtype="float32", device=self.input_device) as stream:
             for _ in range(calib):
                 d, _ = stream.read(bs)
-                noise.append(rms(d.flatten()))
+                noise.append(energy(d.reshape(-1)))
             noise_med = float(np.median(noise)) if noise else 0.0
-            thr = max(float(base_threshold), noise_med * float(threshold_mult))
+            thr2 = max(float(base_threshold) ** 2, noise_med * float(threshold_mult) ** 2)
+            thr = math.sqrt(thr2)
+            ema = noise_med
 
             for _ in range(max_blocks):
                 if stop_event.is_set():
                     break
-                d, _ = stream.read(bs)
-                x = d.flatten()
+                d, overflowed = stream.read(bs)
+                overflows += bool(overflowed)
+                x = d.reshape(-1)
                 total += 1
-                r = rms(x)
+                e = energy(x)
+                ema = 0.7 * ema + 0.3 * e
 
-                if r > thr:
+                if e > thr2:
                     started = True
-                    silent = 0
                     speech += 1
-                    frames.append(x.copy())
+                if not started:
+                    continue
+                is_speech = ema > thr2
+                if is_speech:
+                    silent = 0
                 else:
-                    if started:
-                        silent += 1
-                        frames.append(x.copy())
-                        if speech >= min_speech and total >= min_total and silent >= silence_need:
-                            break
-
-        audio = np.concatenate(frames) if frames else np.zeros(1, dtype="float32")
-        sf.write(out_path, audio, sr)
-        return float(audio.size) / float(sr), thr
+                    silent += 1
+
+                out.write(x)
+                kept += x.size
+                if on_chunk is not None:
+                    on_chunk(x, is_speech)
+                if not is_speech and speech >= min_speech and total >= min_total and silent >= silence_need:
+                    break
+
+            if kept == 0:
+                out.write(np.zeros(1, dtype="float32"))
+                kept = 1
+
+        if overflows:
+            # Input blocks were lost (CPU busy, e.g. transcription): the take has gaps.
+            logger.warning("input overflow on %d/%d blocks: %s", overflows, total, out_path)
+
+        return float(kept) / float(sr), thr
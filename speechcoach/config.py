@@ -17,4 +17,8 @@ DEFAULT_STORIES_PATH = os.path.join(DATA_DIR, "stories.json")
 FALLBACK_STORIES_PATH = os.path.join(PROJECT_ROOT, "stories.json")
 
 # assets (images, cards...)
-RESOURCES_DIR = os.path.join(PROJECT_ROOT, 'ressources')
\ No newline at end of file
+RESOURCES_DIR = os.path.join(PROJECT_ROOT, 'ressources')
+
+# Whisper models kept loaded at once (ASREngine). 2 makes switching back to the
+# previous size instant; 1 saves the memory of a second model.
+ASR_MODEL_CACHE_SIZE = 2
@@ -1,11 +1,29 @@
 import json
+import logging
 import os
+import queue
+import re
 import sqlite3
 import threading
-from typing import Any, Dict, List, Optional
-
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.request import pathname2url
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+try:
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
+from .utils_features import unpack_features
 from .utils_text import now_iso
 
+logger = logging.getLogger(__name__)
+
+# Keys that can be spliced into a JSON path ('$."key"') without escaping.
+_JSON_KEY_RE = re.compile(r"[A-Za-z0-9_]+")
+
 DDL = """
 CREATE TABLE IF NOT EXISTS children(
   id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,6 +35,14 @@ CREATE TABLE IF NOT EXISTS children(
   created_at TEXT
 );
 
+-- Avatars live in their own table so children rows stay narrow.
+-- children.avatar_blob is kept (always NULL) for older app versions.
+CREATE TABLE IF NOT EXISTS child_avatars(
+  child_id INTEGER PRIMARY KEY,
+  avatar_blob BLOB NOT NULL,
+  FOREIGN KEY(child_id) REFERENCES children(id)
+);
+
 CREATE TABLE IF NOT EXISTS sessions(
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   created_at TEXT,
@@ -35,6 +61,7 @@ CREATE TABLE IF NOT EXISTS sessions(
   phoneme_quality REAL,
 
   features_json TEXT,
+  features_blob BLOB,
   acoustic_score REAL,
   acoustic_contrast REAL,
   final_score REAL,
@@ -47,6 +74,7 @@ CREATE TABLE IF NOT EXISTS sessions(
   plan_name TEXT,
   plan_mode TEXT,
   plan_json TEXT,
+  plan_blob BLOB,
 
   FOREIGN KEY(child_id) REFERENCES children(id)
 );
@@ -60,8 +88,9 @@ CREATE TABLE IF NOT EXISTS reference_profiles(
   created_at TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_reference_profiles_child_phoneme
-ON reference_profiles(child_id, phoneme);
+-- Latest profile per (child or NULL, phoneme, label): seek + one index step, no sort.
+CREATE INDEX IF NOT EXISTS idx_reference_profiles_lookup
+ON reference_profiles(child_id, phoneme, label, created_at);
 
 CREATE INDEX IF NOT EXISTS idx_sessions_child_created
 ON sessions(child_id, created_at);
@@ -167,44 +196,115 @@ CREATE TABLE IF NOT EXISTS assignments(
 CREATE INDEX IF NOT EXISTS idx_assignments_target ON assignments(target_type, target_value);
 """
 
-def _column_exists(cur: sqlite3.Cursor, table: str, col: str) -> bool:
-    cur.execute(f"PRAGMA table_info({table})")
-    return any(r[1] == col for r in cur.fetchall())
-
-def migrate_db(conn: sqlite3.Connection) -> None:
-    cur = conn.cursor()
-    cur.executescript(DDL)
-
-    # ---- Ensure sessions plan columns exist (Sprint 1)
+def _column_exists(cur: sqlite3.Cursor, table: str, col: str, cols_cache: Optional[Dict[str, Set[str]]] = None) -> bool:
+    """True if `table` has `col`. With `cols_cache`, PRAGMA table_info runs once per table."""
+    if cols_cache is not None and table in cols_cache:
+        return col in cols_cache[table]
     try:
-        if not _column_exists(cur, "sessions", "plan_id"):
-            cur.execute("ALTER TABLE sessions ADD COLUMN plan_id TEXT")
-        if not _column_exists(cur, "sessions", "plan_name"):
-            cur.execute("ALTER TABLE sessions ADD COLUMN plan_name TEXT")
-        if not _column_exists(cur, "sessions", "plan_mode"):
-            cur.execute("ALTER TABLE sessions ADD COLUMN plan_mode TEXT")
-        if not _column_exists(cur, "sessions", "plan_json"):
-            cur.execute("ALTER TABLE sessions ADD COLUMN plan_json TEXT")
-    except Exception:
-        pass
-
-    # ---- Sprint 8: ensure sessions.run_id exists (link to session_runs)
-    try:
-        if not _column_exists(cur, "sessions", "run_id"):
-            cur.execute("ALTER TABLE sessions ADD COLUMN run_id INTEGER")
-    except Exception:
-        pass
+        # table_xinfo also lists generated columns (SQLite >= 3.26)
+        cur.execute(f"PRAGMA table_xinfo({table})")
+    except sqlite3.OperationalError:
+        cur.execute(f"PRAGMA table_info({table})")
+    cols = {r[1] for r in cur.fetchall()}
+    if cols_cache is not None:
+        cols_cache[table] = cols
+    return col in cols
+
+def _add_column(cur: sqlite3.Cursor, table: str, col: str, typ: str, cols_cache: Optional[Dict[str, Set[str]]] = None) -> None:
+    cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {typ}")
+    if cols_cache is not None and table in cols_cache:
+        cols_cache[table].add(col)
+
+# Indexes on columns that older databases only get through _ADDED_COLUMNS:
+# created by migrate_db once those columns exist.
+DDL_SESSION_INDEXES = """
+-- Phoneme dropdown (prefix) and per-phoneme score series: index-only scans.
+CREATE INDEX IF NOT EXISTS idx_sessions_series
+ON sessions(child_id, phoneme_target, created_at, final_score);
+
+-- Covers the progress/class dashboard reads (scored rows, sorted on the raw
+-- created_at): answered from the index alone, no table lookups.
+CREATE INDEX IF NOT EXISTS idx_sessions_dashboard
+ON sessions(child_id, created_at, final_score, duration_sec, phoneme_target)
+WHERE final_score IS NOT NULL;
+"""
 
-    # ---- Ensure child_cards_v2 snapshot columns exist (tolerant migrations)
+# Columns added to existing tables over the releases (tolerant migration).
+_ADDED_COLUMNS = (
+    # Sprint 1: session plan metadata
+    ("sessions", "plan_id", "TEXT"),
+    ("sessions", "plan_name", "TEXT"),
+    ("sessions", "plan_mode", "TEXT"),
+    ("sessions", "plan_json", "TEXT"),
+    # Sprint 8: link item rows to session_runs
+    ("sessions", "run_id", "INTEGER"),
+    # child_cards_v2 snapshot columns
+    ("child_cards_v2", "card_name", "TEXT"),
+    ("child_cards_v2", "rarity", "TEXT"),
+    ("child_cards_v2", "icon_blob", "BLOB"),
+    # Children schema upgrades (older DBs might miss these)
+    ("children", "avatar_blob", "BLOB"),
+    ("children", "created_at", "TEXT"),
+    ("sessions", "features_json", "TEXT"),
+    ("sessions", "features_blob", "BLOB"),
+    ("sessions", "plan_blob", "BLOB"),
+    ("sessions", "acoustic_score", "REAL"),
+    ("sessions", "acoustic_contrast", "REAL"),
+    ("sessions", "final_score", "REAL"),
+    ("sessions", "phoneme_confidence", "REAL"),
+    ("sessions", "focus_start_sec", "REAL"),
+    ("sessions", "focus_end_sec", "REAL"),
+)
+
+# ISO timestamp -> epoch milliseconds, as computed for sessions.created_at_ms.
+_CREATED_MS_EXPR = "CAST(ROUND((julianday({}) - 2440587.5) * 86400000) AS INTEGER)"
+
+# Stored in PRAGMA user_version once migrate_db has run. Bump it whenever DDL or
+# migrate_db changes so existing databases go through the migration again.
+SCHEMA_VERSION = 9
+
+# Read size when streaming avatar files into the database.
+_AVATAR_CHUNK = 64 * 1024
+
+# Timestamp columns read in ORDER BY; normalized to now_iso()'s format by migrate_db.
+_TIMESTAMP_COLS = (
+    ("sessions", "created_at"),
+    ("child_cards", "obtained_at"),
+    ("child_cards_v2", "obtained_at"),
+    ("session_plans", "updated_at"),
+    ("session_runs", "created_at"),
+)
+
+def migrate_db(conn: sqlite3.Connection, cols_cache: Optional[Dict[str, Set[str]]] = None) -> None:
+    if cols_cache is None:
+        cols_cache = {}
+    cur = conn.cursor()
+    from_version = 0
     try:
-        if not _column_exists(cur, "child_cards_v2", "card_name"):
-            cur.execute("ALTER TABLE child_cards_v2 ADD COLUMN card_name TEXT")
-        if not _column_exists(cur, "child_cards_v2", "rarity"):
-            cur.execute("ALTER TABLE child_cards_v2 ADD COLUMN rarity TEXT")
-        if not _column_exists(cur, "child_cards_v2", "icon_blob"):
-            cur.execute("ALTER TABLE child_cards_v2 ADD COLUMN icon_blob BLOB")
+        cur.execute("PRAGMA user_version")
+        from_version = int(cur.fetchone()[0] or 0)
+        if from_version >= SCHEMA_VERSION:
+            return
     except Exception:
         pass
+    cur.executescript(DDL)
+    # Superseded by idx_sessions_series / idx_reference_profiles_lookup (same leading columns).
+    cur.execute("DROP INDEX IF EXISTS idx_sessions_child_phoneme")
+    cur.execute("DROP INDEX IF EXISTS idx_reference_profiles_child_phoneme")
+
+    # ---- Columns added after the first releases: one transaction (one WAL sync) for all.
+    # Probes are served from cols_cache (one PRAGMA per table); a failing ALTER only
+    # undoes itself.
+    missing = [(t, c, typ) for t, c, typ in _ADDED_COLUMNS if not _column_exists(cur, t, c, cols_cache)]
+    if missing:
+        cur.execute("BEGIN")
+        for table, col, typ in missing:
+            try:
+                _add_column(cur, table, col, typ, cols_cache)
+            except sqlite3.OperationalError:
+                pass
+        conn.commit()
+    cur.executescript(DDL_SESSION_INDEXES)
 
     # ---- Seed cards_catalog if empty (best-effort)
     try:
@@ -219,12 +319,12 @@ def migrate_db(conn: sqlite3.Connection) -> None:
                 cat_path = Path(RESOURCES_DIR) / "cards" / "catalog.json"
                 if cat_path.exists():
                     data = _json.loads(cat_path.read_text(encoding="utf-8"))
-                    for r in data:
-                        cur.execute(
+                    with conn:
+                        cur.executemany(
                             "INSERT OR IGNORE INTO cards_catalog(id,name,icon_path,rarity,min_level) VALUES(?,?,?,?,?)",
-                            (str(r.get("id")), str(r.get("name")), str(r.get("icon")), str(r.get("rarity","common")), int(r.get("min_level",1)))
+                            [(str(r.get("id")), str(r.get("name")), str(r.get("icon")), str(r.get("rarity","common")), int(r.get("min_level",1)))
+                             for r in data]
                         )
-                    conn.commit()
             except Exception:
                 pass
     except Exception:
@@ -239,6 +339,9 @@ def migrate_db(conn: sqlite3.Connection) -> None:
             # map name->id from catalog
             cur.execute("SELECT id, name FROM cards_catalog")
             name_map = {r[1]: r[0] for r in cur.fetchall()}
+            new_cards = []
+            owned = []
+            ts = now_iso()
             for r in rows:
                 cid = int(r[0])
                 nm = str(r[1])
@@ -247,115 +350,521 @@ def migrate_db(conn: sqlite3.Connection) -> None:
                 if not card_id:
                     # create a minimal catalog entry for unknown names
                     card_id = nm.lower().replace(" ", "_")
-                    cur.execute(
-                        "INSERT OR IGNORE INTO cards_catalog(id,name,icon_path,rarity,min_level) VALUES(?,?,?,?,?)",
-                        (card_id, nm, "", "common", 1)
-                    )
-                cur.execute(
+                    new_cards.append((card_id, nm, "", "common", 1))
+                owned.append((cid, card_id, dt or ts))
+            with conn:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO cards_catalog(id,name,icon_path,rarity,min_level) VALUES(?,?,?,?,?)",
+                    new_cards
+                )
+                cur.executemany(
                     "INSERT OR IGNORE INTO child_cards_v2(child_id, card_id, obtained_at) VALUES(?,?,?)",
-                    (cid, card_id, dt or now_iso())
+                    owned
                 )
+    except Exception:
+        pass
+
+    # now_iso() writes "YYYY-MM-DD HH:MM:SS"; rewrite older ISO "T" timestamps once so
+    # these columns sort correctly as plain text (and can use their indexes).
+    for table, col in _TIMESTAMP_COLS:
+        try:
+            with conn:
+                cur.execute(f"UPDATE {table} SET {col}=REPLACE({col},'T',' ') WHERE {col} LIKE '%T%'")
+        except Exception:
+            pass
+
+    # sessions.created_at_ms: epoch milliseconds derived from created_at by SQLite
+    # (virtual generated column, nothing to backfill or write). Indexed reads sort
+    # on 8-byte integers instead of re-parsing the text per row.
+    try:
+        if not _column_exists(cur, "sessions", "created_at_ms", cols_cache):
+            _add_column(
+                cur, "sessions", "created_at_ms",
+                f"INTEGER GENERATED ALWAYS AS ({_CREATED_MS_EXPR.format('created_at')}) VIRTUAL",
+                cols_cache,
+            )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_child_created_ms ON sessions(child_id, created_at_ms)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created_ms ON sessions(created_at_ms)")
+        cur.execute("DROP INDEX IF EXISTS idx_sessions_created")
+        conn.commit()
+    except Exception:
+        # SQLite < 3.31 has no generated columns: reads keep sorting on created_at
+        try:
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created_at)")
             conn.commit()
+        except Exception:
+            pass
+
+    # sessions.plan_json -> zlib plan_blob (the same plan is repeated on every row of a run).
+    try:
+        if _column_exists(cur, "sessions", "plan_blob", cols_cache):
+            cur.execute("SELECT id, plan_json FROM sessions WHERE plan_json IS NOT NULL AND plan_blob IS NULL")
+            packed = [(_pack_text(r[1]), r[0]) for r in cur.fetchall()]
+            if packed:
+                with conn:
+                    cur.executemany("UPDATE sessions SET plan_blob=?, plan_json=NULL WHERE id=?", packed)
     except Exception:
         pass
 
-    add_cols = [
-        # Children schema upgrades (older DBs might miss these)
-        ("children", "avatar_blob", "BLOB"),
-        ("children", "created_at", "TEXT"),
-        ("sessions", "features_json", "TEXT"),
-        ("sessions", "acoustic_score", "REAL"),
-        ("sessions", "acoustic_contrast", "REAL"),
-        ("sessions", "final_score", "REAL"),
-        ("sessions", "phoneme_confidence", "REAL"),
-        ("sessions", "focus_start_sec", "REAL"),
-        ("sessions", "focus_end_sec", "REAL"),
-    ]
-    for table, col, typ in add_cols:
-        if not _column_exists(cur, table, col):
-            cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {typ}")
-    conn.commit()
+    # Move avatars out of the children rows (one transaction).
+    try:
+        with conn:
+            cur.execute(
+                "INSERT OR REPLACE INTO child_avatars(child_id, avatar_blob) "
+                "SELECT id, avatar_blob FROM children WHERE avatar_blob IS NOT NULL"
+            )
+            cur.execute("UPDATE children SET avatar_blob=NULL WHERE avatar_blob IS NOT NULL")
+    except Exception:
+        pass
 
-    # Best-effort backfill: if avatar_blob is empty but avatar_path points to an existing file,
-    # store the binary in DB to avoid runtime dependency on filesystem paths.
+    # Best-effort backfill: if a child has no stored avatar but avatar_path points to an
+    # existing file, store the binary in DB to avoid runtime dependency on filesystem paths.
     try:
-        if _column_exists(cur, "children", "avatar_blob") and _column_exists(cur, "children", "avatar_path"):
-            cur.execute("SELECT id, avatar_path, avatar_blob FROM children")
-            rows = cur.fetchall()
-            for r in rows:
+        if _column_exists(cur, "children", "avatar_path", cols_cache):
+            cur.execute(
+                "SELECT c.id, c.avatar_path FROM children c "
+                "LEFT JOIN child_avatars a ON a.child_id = c.id "
+                "WHERE a.child_id IS NULL AND COALESCE(c.avatar_path,'') <> ''"
+            )
+            for child_id, path in cur.fetchall():
                 try:
-                    if r[2] is not None:
+                    p = (path or "").strip()
+                    if not p or not os.path.isfile(p):
                         continue
-                    p = (r[1] or "").strip()
-                    if not p or not os.path.exists(p):
+                    size = os.path.getsize(p)
+                    if size == 0:
                         continue
-                    with open(p, "rb") as f:
-                        blob = f.read()
-                    if blob:
-                        cur.execute("UPDATE children SET avatar_blob=? WHERE id=?", (sqlite3.Binary(blob), r[0]))
+                    with conn:
+                        _store_avatar_file(conn, int(child_id), p, size)
                 except Exception:
                     continue
-            conn.commit()
     except Exception:
         # Never fail migration because of avatar backfill
         pass
 
+    # Files from before schema 7 were created with 4 KB pages: rebuild them once at
+    # _PAGE_SIZE (page_size only changes through VACUUM, and not while in WAL mode).
+    # VACUUM rewrites the whole file synchronously, so this blocks startup for a time
+    # proportional to the database size (a few seconds for large histories). It is
+    # attempted only on the upgrade crossing version 7; if another connection keeps
+    # the file in WAL, it is logged and skipped rather than retried every launch.
+    if from_version < 7:
+        try:
+            cur.execute("PRAGMA page_size")
+            old_size = int(cur.fetchone()[0] or 0)
+            if old_size < _PAGE_SIZE:
+                conn.commit()
+                mode = str(cur.execute("PRAGMA journal_mode").fetchone()[0]).lower()
+                if mode == "wal":
+                    cur.execute("PRAGMA journal_mode=DELETE")
+                try:
+                    cur.execute(f"PRAGMA page_size={_PAGE_SIZE}")
+                    cur.execute("VACUUM")
+                finally:
+                    if mode == "wal":
+                        cur.execute("PRAGMA journal_mode=WAL")
+                new_size = int(cur.execute("PRAGMA page_size").fetchone()[0] or 0)
+                if new_size != _PAGE_SIZE:
+                    logger.warning("page_size rebuild skipped (still %d bytes, journal busy?)", new_size)
+        except Exception:
+            logger.exception("page_size rebuild failed")
+
+    # Planner stats for the (possibly new) indexes; bounded by analysis_limit.
+    try:
+        cur.execute("ANALYZE")
+    except Exception:
+        pass
+
+    cur.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    conn.commit()
+
+def _store_avatar_file(conn: sqlite3.Connection, child_id: int, path: str, size: int) -> None:
+    """Copy an image file into child_avatars without holding it whole in memory."""
+    if not hasattr(conn, "blobopen"):  # Python < 3.11
+        with open(path, "rb") as f:
+            conn.execute("INSERT OR REPLACE INTO child_avatars(child_id, avatar_blob) VALUES(?,?)", (child_id, f.read()))
+        return
+    # child_id is the rowid of child_avatars: reserve the blob, then fill it in place.
+    conn.execute("INSERT OR REPLACE INTO child_avatars(child_id, avatar_blob) VALUES(?, zeroblob(?))", (child_id, size))
+    with open(path, "rb") as f, conn.blobopen("child_avatars", "avatar_blob", child_id) as blob:
+        for chunk in iter(lambda: f.read(_AVATAR_CHUNK), b""):
+            blob.write(chunk)
+
+def _readonly_uri(db_path: str) -> Optional[str]:
+    if not db_path or db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    return "file:" + pathname2url(os.path.abspath(db_path)) + "?mode=ro"
+
+def _json_loads(data: Any) -> Any:
+    """json.loads, through orjson when it is installed (several times faster)."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    """json.dumps(obj, ensure_ascii=False), through orjson when it is installed."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS | _orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+def _as_blob(data: Any) -> Optional[memoryview]:
+    """Bind bytes-like data as a BLOB without copying it (None if empty/invalid)."""
+    if not data:
+        return None
+    try:
+        return memoryview(data)
+    except TypeError:
+        return None
+
+def _pack_text(text: Optional[str]) -> Optional[bytes]:
+    """zlib-compress a JSON text column (level 1: the win is size, not ratio)."""
+    if not text:
+        return None
+    return zlib.compress(text.encode("utf-8"), 1)
+
+def _unpack_text(blob: Optional[bytes]) -> Optional[str]:
+    if not blob:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
+
+def _session_values(s: Dict[str, Any], cols: List[str]) -> tuple:
+    # plan_json text is stored compressed in plan_blob. Callers writing many rows
+    # with the same plan (a game run) pass plan_blob already packed instead.
+    if "plan_blob" not in s and s.get("plan_json"):
+        s = dict(s, plan_blob=_pack_text(s["plan_json"]), plan_json=None)
+    return tuple(map(s.get, cols))
+
+# CSV export: keep multi-line texts on one row.
+_NEWLINES_TO_SPACE = str.maketrans({"\n": " ", "\r": " "})
+
+# Per-connection prepared statement cache. DataLayer issues ~80 distinct SQL
+# strings plus the filter variants of fetch_sessions_filtered/list_exercises;
+# the sqlite3 default (128) would start evicting hot ones.
+_STATEMENT_CACHE = 256
+
+# Session rows written between two PRAGMA optimize runs (see _count_session_writes).
+_OPTIMIZE_EVERY = 200
+
+# UPDATE ... RETURNING (SQLite >= 3.35)
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Period keys for get_score_series_binned (ISO dates, so they sort and parse as such).
+_SERIES_BUCKETS = {
+    "day": "substr(created_at, 1, 10)",
+    "week": "date(created_at, 'weekday 0', '-6 days')",
+}
+
+# Rows per fetchmany() when streaming session listings.
+_FETCH_BATCH = 256
+
+# Max ids bound per "... WHERE id IN (?,?,...)" statement.
+_IN_CHUNK = 500
+
+# Columns written by save_session (run_id is appended when the DB has it).
+_SESSION_INSERT_COLS = (
+    "created_at","child_id","story_id","story_title","goal","sentence_index",
+    "expected_text","recognized_text","wer","audio_path","duration_sec",
+    "phoneme_target","spectral_centroid_hz","phoneme_quality",
+    "features_json","features_blob","acoustic_score","acoustic_contrast","final_score",
+    "phoneme_confidence","focus_start_sec","focus_end_sec",
+    "plan_id","plan_name","plan_mode","plan_json","plan_blob",
+)
+
+# Columns read by the sessions views (dashboard); avoids pulling features_json/blob.
+_SESSION_LIST_COLS = (
+    "id,created_at,child_id,story_id,story_title,expected_text,recognized_text,"
+    "wer,final_score,phoneme_target,audio_path"
+)
+
+# sessions rows carry long texts; 8 KB pages keep most of them off overflow chains.
+_PAGE_SIZE = 8192
+
+@lru_cache(maxsize=16)
+def _sessions_filtered_sql(created_key: str, by_child: bool, by_phoneme: bool, keyset: bool) -> str:
+    # One SQL text per filter shape, so sqlite3's statement cache gets exact hits.
+    clauses = []
+    if by_child:
+        clauses.append("child_id=?")
+    if by_phoneme:
+        clauses.append("phoneme_target=?")
+    if keyset:
+        key = _CREATED_MS_EXPR.format("?") if created_key == "created_at_ms" else "?"
+        clauses.append(f"({created_key}, id) < ({key}, ?)")
+    where = ("WHERE " + " AND ".join(clauses) + " ") if clauses else ""
+    return f"SELECT {_SESSION_LIST_COLS} FROM sessions {where}ORDER BY {created_key} DESC, id DESC LIMIT ?"
+
+# journal_mode is persistent in the DB file: switch it once per path and process.
+_WAL_PATHS = set()
+
+# Per-connection tuning for write-heavy session logging.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",   # safe with WAL: no fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-64000",    # ~64 MB page cache
+    "PRAGMA busy_timeout=5000",    # SettingsManager writes through its own connections
+    "PRAGMA analysis_limit=400",   # bounds the ANALYZE work done by PRAGMA optimize
+)
+
+def _apply_pragmas(conn: sqlite3.Connection, db_path: str) -> None:
+    try:
+        if db_path not in _WAL_PATHS:
+            # Only effective on a new, empty file: must precede journal_mode=WAL,
+            # which writes the first page.
+            conn.execute(f"PRAGMA page_size={_PAGE_SIZE}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            _WAL_PATHS.add(db_path)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    except Exception:
+        pass
+
+class SessionBatch:
+    """Session rows of one game run, written together by DataLayer.save_sessions.
+
+    With flush_every > 0, rows are also written every N rounds so that a crash
+    loses at most N rounds. Use as a context manager, or call close() (e.g. in a
+    finally block): both write what is still buffered.
+    """
+
+    def __init__(self, dl: "DataLayer", flush_every: int = 0):
+        self._dl = dl
+        self._rows: List[Dict[str, Any]] = []
+        self._every = max(0, int(flush_every or 0))
+
+    def add(self, s: Dict[str, Any]) -> None:
+        self._rows.append(s)
+        if self._every and len(self._rows) >= self._every:
+            self.flush()
+
+    def flush(self) -> List[int]:
+        """Write the buffered rows in one transaction. Returns their ids."""
+        # Kept on failure: a later flush/close retries them.
+        ids = self._dl.save_sessions(self._rows)
+        self._rows = []
+        return ids
+
+    def close(self) -> List[int]:
+        return self.flush()
+
+    def __enter__(self) -> "SessionBatch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 class DataLayer:
     """Repository SQLite (thread-safe)."""
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=_STATEMENT_CACHE)
         self.conn.row_factory = sqlite3.Row
         # Re-entrant lock: some public methods call other methods that also
-        # take the DB lock (e.g. get_child_session_summary -> get_child_progress
-        # -> ensure_child_progress). A plain Lock would deadlock.
+        # take the DB lock (e.g. get_child_session_summary -> get_child_progress,
+        # or anything called inside transaction()). A plain Lock would deadlock.
         self.lock = threading.RLock()
-        migrate_db(self.conn)
-    def get_audio_path_by_session_id(self, session_id: int) -> str | None:
+        _apply_pragmas(self.conn, self.db_path)
+        # table -> column names, filled by migrate_db and kept in sync with its ALTERs.
+        self._cols: Dict[str, Set[str]] = {}
+        migrate_db(self.conn, self._cols)
+        self._sql_insert_session: Optional[tuple] = None
+        self._writes_since_optimize = 0
+        # Sort key for sessions by date (see migrate_db)
+        self._created_key = "created_at_ms" if self._has_column("sessions", "created_at_ms") else "created_at"
+        # Read-only connections for readers (see _reader): with WAL they don't wait
+        # for the writer, so self.lock is only taken by writes.
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._read_uri = _readonly_uri(self.db_path)
+        # session id -> stored audio_path (immutable once written; dropped on delete).
+        self._audio_cache: Dict[int, str] = {}
+        # Depth of nested transaction() blocks (only touched under self.lock).
+        self._tx_depth = 0
+        # Thread running the open transaction() block, whose reads go to self.conn.
+        self._tx_thread: Optional[int] = None
+
+    def _open_reader(self) -> Optional[sqlite3.Connection]:
+        if self._read_uri is None:
+            return None
+        try:
+            conn = sqlite3.connect(self._read_uri, uri=True, check_same_thread=False, cached_statements=_STATEMENT_CACHE)
+        except Exception:
+            self._read_uri = None
+            return None
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn, self.db_path)
+        return conn
+
+    @contextmanager
+    def _reader(self, named: bool = True):
+        """Yield a cursor on a pooled read-only connection.
+
+        Falls back to the main connection under self.lock when read-only
+        connections can't be opened (e.g. in-memory databases), and inside a
+        transaction() block on its own thread, so the block reads its own
+        uncommitted writes. With named=False the cursor returns plain tuples
+        instead of sqlite3.Row, for reads that only index rows by position.
+        """
+        if self._tx_thread == threading.get_ident():
+            with self.lock:
+                yield self._cursor(self.conn, named)
+            return
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        if conn is None:
+            with self.lock:
+                yield self._cursor(self.conn, named)
+            return
+        try:
+            yield self._cursor(conn, named)
+        finally:
+            self._read_pool.put(conn)
+
+    @staticmethod
+    def _cursor(conn: sqlite3.Connection, named: bool) -> sqlite3.Cursor:
+        cur = conn.cursor()
+        if not named:
+            cur.row_factory = None
+        return cur
+    def _has_column(self, table: str, col: str) -> bool:
+        # Cached answer without the writer lock: readers (e.g. list_children)
+        # must not wait for an in-flight write just to check the schema.
+        cols = self._cols.get(table)
+        if cols is not None:
+            return col in cols
         with self.lock:
-            cur = self.conn.cursor()
+            return _column_exists(self.conn.cursor(), table, col, self._cols)
+
+    def get_audio_path_by_session_id(self, session_id: int) -> str | None:
+        session_id = int(session_id)
+        # Single dict get/set are atomic: the cache is not guarded by the writer lock.
+        cached = self._audio_cache.get(session_id)
+        if cached is not None:
+            return cached
+        with self._reader(named=False) as cur:
             cur.execute(
                 "SELECT audio_path FROM sessions WHERE id = ?",
                 (session_id,)
             )
             row = cur.fetchone()
-            return row[0] if row else None
+        path = row[0] if row else None
+        # Misses are not cached: the row may still be sitting in a session batch.
+        if path:
+            self._audio_cache[session_id] = path
+        return path
+
+    @contextmanager
+    def transaction(self):
+        """Group several write methods into one commit.
+
+        The writer lock is held for the whole block; the methods called inside
+        skip their own commit. Rolls everything back if the block raises.
+        A nested block is a savepoint: if it raises, only its own writes are
+        undone, and the outer block decides whether to commit the rest.
+        Reads made inside the block (on this thread) see its uncommitted writes.
+        """
+        with self.lock:
+            savepoint = None
+            if self._tx_depth == 0:
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN IMMEDIATE")
+                self._tx_thread = threading.get_ident()
+            else:
+                savepoint = f"tx{self._tx_depth}"
+                self.conn.execute(f"SAVEPOINT {savepoint}")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if savepoint is not None:
+                    self.conn.execute(f"ROLLBACK TO {savepoint}")
+                    self.conn.execute(f"RELEASE {savepoint}")
+                else:
+                    self._tx_thread = None
+                    self.conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if savepoint is not None:
+                self.conn.execute(f"RELEASE {savepoint}")
+            else:
+                self._tx_thread = None
+                self.conn.commit()
+
+    def _commit(self) -> None:
+        if self._tx_depth == 0:
+            self.conn.commit()
+
+    def _rollback(self) -> None:
+        if self._tx_depth == 0:
+            self.conn.rollback()
 
     def close(self):
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+            except Exception:
+                pass
+        # Let SQLite refresh planner stats for the indexes used during this run.
+        try:
+            self.conn.execute("PRAGMA optimize")
+        except Exception:
+            pass
         try:
             self.conn.close()
         except Exception:
             pass
 
     # --- children
-    def list_children(self):
-        with self.lock:
-            cur = self.conn.cursor()
+    def list_children(self, with_avatar: bool = False):
+        """List children, newest first.
+
+        avatar_blob is only selected when `with_avatar` is set (it can weigh
+        hundreds of KB per row); see get_child_avatar for a single child.
+        """
+        if with_avatar:
+            cols = "c.id,c.name,c.age,c.sex,c.grade,a.avatar_blob,c.created_at"
+            src = "children c LEFT JOIN child_avatars a ON a.child_id = c.id"
+        else:
+            cols = "c.id,c.name,c.age,c.sex,c.grade,c.created_at"
+            src = "children c"
+        with self._reader() as cur:
             # Older DBs may not have created_at yet; be defensive.
-            if _column_exists(cur, "children", "created_at"):
-                cur.execute("""SELECT id,name,age,sex,grade,avatar_blob,created_at
-                               FROM children
-                               ORDER BY created_at DESC""")
+            if self._has_column("children", "created_at"):
+                cur.execute(f"""SELECT {cols}
+                               FROM {src}
+                               ORDER BY c.created_at DESC""")
             else:
-                cur.execute("""SELECT id,name,age,sex,grade,avatar_blob,created_at
-                               FROM children
-                               ORDER BY id DESC""")
+                cur.execute(f"""SELECT {cols}
+                               FROM {src}
+                               ORDER BY c.id DESC""")
             return cur.fetchall()
 
+    def get_child_avatar(self, child_id: int) -> Optional[bytes]:
+        with self._reader(named=False) as cur:
+            cur.execute("SELECT avatar_blob FROM child_avatars WHERE child_id=?", (child_id,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
     def get_child(self, child_id: int):
-        """Return a child row as a dict-like sqlite3.Row, or None."""
-        with self.lock:
-            cur = self.conn.cursor()
-            cur.execute("SELECT * FROM children WHERE id=?", (child_id,))
+        """Return a child row as a dict-like sqlite3.Row, or None (avatar: see get_child_avatar)."""
+        with self._reader() as cur:
+            cur.execute("SELECT id,name,age,sex,grade,created_at FROM children WHERE id=?", (child_id,))
             return cur.fetchone()
 
     # --- rewards / collections
     def list_child_cards(self, child_id: int) -> List[str]:
         """Return all collected card names for a child."""
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             cur.execute(
-                "SELECT card_name FROM child_cards WHERE child_id=? ORDER BY datetime(REPLACE(obtained_at,'T',' ')) DESC",
+                "SELECT card_name FROM child_cards WHERE child_id=? ORDER BY obtained_at DESC",
                 (int(child_id),)
             )
             return [r[0] for r in cur.fetchall()]
@@ -364,14 +873,15 @@ class DataLayer:
         """Insert a card if not already owned. Returns True if inserted."""
         if not card_name:
             return False
+        ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
             try:
                 cur.execute(
                     "INSERT OR IGNORE INTO child_cards(child_id, card_name, obtained_at) VALUES(?,?,?)",
-                    (int(child_id), str(card_name).strip(), now_iso())
+                    (int(child_id), str(card_name).strip(), ts)
                 )
-                self.conn.commit()
+                self._commit()
                 return cur.rowcount > 0
             except Exception:
                 return False
@@ -384,30 +894,44 @@ class DataLayer:
         with self.lock:
             cur = self.conn.cursor()
             cur.execute("INSERT OR IGNORE INTO child_progress(child_id) VALUES(?)", (int(child_id),))
-            self.conn.commit()
+            self._commit()
 
     def get_child_progress(self, child_id: int) -> Optional[sqlite3.Row]:
-        self.ensure_child_progress(child_id)
+        # Common case: the row exists; read it without the writer lock or a commit.
+        with self._reader() as cur:
+            cur.execute("SELECT * FROM child_progress WHERE child_id=?", (int(child_id),))
+            row = cur.fetchone()
+        if row is not None:
+            return row
         with self.lock:
             cur = self.conn.cursor()
+            if _HAS_RETURNING:
+                cur.execute(
+                    "INSERT INTO child_progress(child_id) VALUES(?) "
+                    "ON CONFLICT(child_id) DO UPDATE SET child_id=excluded.child_id RETURNING *",
+                    (int(child_id),)
+                )
+                row = cur.fetchone()
+                self._commit()
+                return row
+            cur.execute("INSERT OR IGNORE INTO child_progress(child_id) VALUES(?)", (int(child_id),))
+            self._commit()
             cur.execute("SELECT * FROM child_progress WHERE child_id=?", (int(child_id),))
             return cur.fetchone()
 
     def list_child_cards_v2(self, child_id: int) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute(
                 """SELECT card_id, card_name, icon_blob, rarity, obtained_at
                    FROM child_cards_v2
                    WHERE child_id=?
-                   ORDER BY datetime(REPLACE(obtained_at,'T',' ')) DESC""",
+                   ORDER BY obtained_at DESC""",
                 (int(child_id),)
             )
             return cur.fetchall()
 
     def list_owned_card_ids(self, child_id: int) -> List[str]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             cur.execute("SELECT card_id FROM child_cards_v2 WHERE child_id=?", (int(child_id),))
             return [r[0] for r in cur.fetchall()]
 
@@ -418,113 +942,130 @@ class DataLayer:
         card_name = getattr(card, 'name', None) or (card.get('name') if isinstance(card, dict) else None)
         rarity = getattr(card, 'rarity', None) or (card.get('rarity') if isinstance(card, dict) else None)
         icon_blob = getattr(card, 'icon_bytes', None) or (card.get('icon_bytes') if isinstance(card, dict) else None) or b""
+        ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
             try:
                 cur.execute(
                     "INSERT OR IGNORE INTO child_cards_v2(child_id, card_id, card_name, rarity, icon_blob, obtained_at) VALUES(?,?,?,?,?,?)",
-                    (int(child_id), str(card_id).strip(), card_name, rarity, sqlite3.Binary(icon_blob), now_iso())
+                    (int(child_id), str(card_id).strip(), card_name, rarity, _as_blob(icon_blob) or b"", ts)
                 )
-                self.conn.commit()
+                self._commit()
                 return cur.rowcount > 0
             except Exception:
                 return False
 
     def get_card_catalog(self) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute("SELECT * FROM cards_catalog ORDER BY min_level ASC, rarity ASC, name ASC")
             return cur.fetchall()
 
     def upsert_progress_after_session(self, child_id: int, final_score: float) -> sqlite3.Row:
         """Update XP/level/streak after a session. Returns updated progress row."""
-        from datetime import date
+        from datetime import date, timedelta
         from .rewards import compute_xp_gain, level_from_xp
 
-        self.ensure_child_progress(child_id)
-        today = date.today().isoformat()
+        # Date math and both possible XP gains are computed before taking the lock;
+        # inside it only the read-modify-write of the row remains.
+        d_today = date.today()
+        today = d_today.isoformat()
+        yesterday = (d_today - timedelta(days=1)).isoformat()
+        gain_same_day = int(compute_xp_gain(final_score=final_score, used_today=True))
+        gain_new_day = int(compute_xp_gain(final_score=final_score, used_today=False))
 
         with self.lock:
             cur = self.conn.cursor()
-            cur.execute("SELECT * FROM child_progress WHERE child_id=?", (int(child_id),))
+            # Same transaction as the UPDATE below (no separate commit for a new child).
+            cur.execute("INSERT OR IGNORE INTO child_progress(child_id) VALUES(?)", (int(child_id),))
+            cur.execute("SELECT xp, total_sessions, streak, last_play_date FROM child_progress WHERE child_id=?", (int(child_id),))
             p = cur.fetchone()
-            last_play = (p["last_play_date"] if p and "last_play_date" in p.keys() else None)
+            last_play = str(p["last_play_date"] or "")[:10]
 
             used_today = (last_play == today)
-            gain = compute_xp_gain(final_score=final_score, used_today=used_today)
-
-            xp = int(p["xp"] or 0) + int(gain)
+            xp = int(p["xp"] or 0) + (gain_same_day if used_today else gain_new_day)
             lvl = int(level_from_xp(xp))
             total = int(p["total_sessions"] or 0) + (0 if used_today else 1)
 
-            # streak: increments only once per day
+            # streak: increments only once per day; naive: +1 if last play was yesterday, else reset to 1
             streak = int(p["streak"] or 0)
             if not used_today:
-                # naive streak: if last_play was yesterday -> +1 else reset to 1
-                try:
-                    from datetime import datetime, timedelta
-                    if last_play:
-                        d0 = datetime.fromisoformat(last_play).date()
-                        if d0 == (date.today() - timedelta(days=1)):
-                            streak += 1
-                        else:
-                            streak = 1
-                    else:
-                        streak = 1
-                except Exception:
-                    streak = 1
+                streak = streak + 1 if last_play == yesterday else 1
 
+            params = (xp, lvl, total, today, streak, int(child_id))
+            if _HAS_RETURNING:
+                cur.execute(
+                    """UPDATE child_progress SET xp=?, level=?, total_sessions=?, last_play_date=?, streak=? WHERE child_id=? RETURNING *""",
+                    params
+                )
+                row = cur.fetchone()
+                self._commit()
+                return row
             cur.execute(
                 """UPDATE child_progress SET xp=?, level=?, total_sessions=?, last_play_date=?, streak=? WHERE child_id=?""",
-                (xp, lvl, total, today, streak, int(child_id))
+                params
             )
-            self.conn.commit()
+            self._commit()
             cur.execute("SELECT * FROM child_progress WHERE child_id=?", (int(child_id),))
             return cur.fetchone()
 
     def get_score_series(self, child_id: int, phoneme: str) -> List[tuple]:
         """Return list of (created_at, final_score) for an enfant + phonème."""
         ph = (phoneme or "").strip()
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             if not ph or ph.lower() == "tous":
                 cur.execute(
                     """SELECT created_at, final_score FROM sessions
-                         WHERE child_id=? AND final_score IS NOT NULL
-                         ORDER BY datetime(REPLACE(created_at,'T',' ')) ASC""",
+                         WHERE child_id=? AND final_score IS NOT NULL AND created_at <> ''
+                         ORDER BY created_at ASC""",
                     (int(child_id),)
                 )
             else:
                 cur.execute(
                     """SELECT created_at, final_score FROM sessions
-                         WHERE child_id=? AND phoneme_target=? AND final_score IS NOT NULL
-                         ORDER BY datetime(REPLACE(created_at,'T',' ')) ASC""",
+                         WHERE child_id=? AND phoneme_target=? AND final_score IS NOT NULL AND created_at <> ''
+                         ORDER BY created_at ASC""",
                     (int(child_id), ph)
                 )
-            return [(r[0], float(r[1])) for r in cur.fetchall() if r[0] and r[1] is not None]
+            # Filtered in SQL; final_score has REAL affinity, so rows come back as floats.
+            return list(cur)
+
+    def get_score_series_binned(self, child_id: int, phoneme: str, bucket: str = "day") -> List[tuple]:
+        """Return list of (period, avg_score, n) per day (or per week, keyed by its Monday)."""
+        ph = (phoneme or "").strip()
+        key = _SERIES_BUCKETS.get(bucket, _SERIES_BUCKETS["day"])
+        sql = f"""SELECT {key} AS period, AVG(final_score), COUNT(*) FROM sessions
+                  WHERE child_id=? {{}}AND final_score IS NOT NULL AND created_at <> ''
+                  GROUP BY period ORDER BY period ASC"""
+        with self._reader(named=False) as cur:
+            if not ph or ph.lower() == "tous":
+                cur.execute(sql.format(""), (int(child_id),))
+            else:
+                cur.execute(sql.format("AND phoneme_target=? "), (int(child_id), ph))
+            return list(cur)
 
     def list_distinct_phonemes(self, child_id: Optional[int]=None, limit: int=50) -> List[str]:
         """Return distinct phoneme_target values (empty/NULL excluded), optionally filtered by child."""
-        with self.lock:
-            cur = self.conn.cursor()
+        # Grouping on the raw column walks idx_sessions_series in order;
+        # NULL and '' are merged afterwards (hence one extra row).
+        with self._reader(named=False) as cur:
             if child_id:
                 cur.execute(
-                    "SELECT DISTINCT COALESCE(phoneme_target,'') AS p FROM sessions WHERE child_id=? ORDER BY p LIMIT ?",
-                    (child_id, limit)
+                    "SELECT phoneme_target FROM sessions WHERE child_id=? GROUP BY phoneme_target ORDER BY phoneme_target LIMIT ?",
+                    (child_id, int(limit) + 1)
                 )
             else:
                 cur.execute(
-                    "SELECT DISTINCT COALESCE(phoneme_target,'') AS p FROM sessions ORDER BY p LIMIT ?",
-                    (limit,)
+                    "SELECT phoneme_target FROM sessions GROUP BY phoneme_target ORDER BY phoneme_target LIMIT ?",
+                    (int(limit) + 1,)
                 )
-            return [r[0] for r in cur.fetchall() if r[0] is not None]
+            out = list(dict.fromkeys(r[0] or "" for r in cur.fetchall()))
+            return out[:int(limit)]
 
 
     # --- Sprint 6: progress dashboard helpers ---------------------------------
     def get_child_session_summary(self, child_id: int) -> Dict[str, Any]:
         """Return a quick, human-facing summary for the progress dashboard."""
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute(
                 """SELECT
                        COUNT(*) AS n,
@@ -539,33 +1080,31 @@ class DataLayer:
             total_dur = float(r["total_dur"] or 0.0) if r else 0.0
             avg_score = float(r["avg_score"] or 0.0) if r else 0.0
 
-            # Use child_progress for streak/level/xp (best effort)
-            p = self.get_child_progress(child_id)
-            out: Dict[str, Any] = {
-                "total_sessions": n,
-                "total_duration_sec": total_dur,
-                "avg_score": avg_score,
-                "xp": int(p["xp"] or 0) if p else 0,
-                "level": int(p["level"] or 1) if p else 1,
-                "streak": int(p["streak"] or 0) if p else 0,
-                "last_play_date": (p["last_play_date"] if p else None),
-            }
-            return out
+        # Use child_progress for streak/level/xp (best effort)
+        p = self.get_child_progress(child_id)
+        out: Dict[str, Any] = {
+            "total_sessions": n,
+            "total_duration_sec": total_dur,
+            "avg_score": avg_score,
+            "xp": int(p["xp"] or 0) if p else 0,
+            "level": int(p["level"] or 1) if p else 1,
+            "streak": int(p["streak"] or 0) if p else 0,
+            "last_play_date": (p["last_play_date"] if p else None),
+        }
+        return out
 
     def get_child_recent_scores(self, child_id: int, limit: int = 20) -> List[tuple]:
         """Return list of (created_at, final_score) for the last N sessions."""
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             cur.execute(
                 """SELECT created_at, final_score FROM sessions
-                     WHERE child_id=? AND final_score IS NOT NULL
-                     ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC
+                     WHERE child_id=? AND final_score IS NOT NULL AND created_at <> ''
+                     ORDER BY created_at DESC
                      LIMIT ?""",
                 (int(child_id), int(limit)),
             )
-            rows = cur.fetchall()
+            out = list(cur)
             # Return chronological order for plotting
-            out = [(r[0], float(r[1])) for r in rows if r[0] and r[1] is not None]
             out.reverse()
             return out
 
@@ -581,47 +1120,44 @@ class DataLayer:
         - Improving: compare a recent window vs a previous window for the same phoneme.
           The number of samples considered is controlled by `limit`.
         """
-        with self.lock:
-            cur = self.conn.cursor()
+        half = max(5, int(limit) // 2)
+        with self._reader(named=False) as cur:
+            # One pass: per-phoneme totals plus the averages of the `half` most
+            # recent scores and of the `half` before them (within `limit`).
             cur.execute(
-                """SELECT phoneme_target AS p,
+                """WITH ranked AS (
+                       SELECT phoneme_target AS p, final_score AS s,
+                              ROW_NUMBER() OVER (PARTITION BY phoneme_target
+                                                 ORDER BY created_at DESC) AS rn
+                       FROM sessions
+                       WHERE child_id=:child_id AND final_score IS NOT NULL
+                         AND phoneme_target <> ''
+                   )
+                   SELECT p,
                           COUNT(*) AS n,
-                          AVG(final_score) AS avg
-                   FROM sessions
-                   WHERE child_id=? AND final_score IS NOT NULL
-                     AND COALESCE(phoneme_target,'') <> ''
-                   GROUP BY phoneme_target
-                   HAVING COUNT(*) >= ?
+                          AVG(s) AS avg,
+                          AVG(CASE WHEN rn <= :half THEN s END) AS recent_avg,
+                          COUNT(CASE WHEN rn <= :half THEN 1 END) AS n_recent,
+                          AVG(CASE WHEN rn > :half AND rn <= MIN(2 * :half, :lim) THEN s END) AS prev_avg,
+                          COUNT(CASE WHEN rn > :half AND rn <= MIN(2 * :half, :lim) THEN 1 END) AS n_prev
+                   FROM ranked
+                   GROUP BY p
+                   HAVING COUNT(*) >= :min_count
                    ORDER BY avg ASC""",
-                (int(child_id), int(min_count)),
+                {"child_id": int(child_id), "half": half, "lim": int(limit), "min_count": int(min_count)},
             )
-            agg = [(str(r["p"]), int(r["n"]), float(r["avg"] or 0.0)) for r in cur.fetchall()]
+            rows = cur.fetchall()
 
+            agg = [(str(r[0]), int(r[1]), float(r[2] or 0.0)) for r in rows]
             weakest = agg[:3]
 
-            # Improving: per phoneme, fetch last `limit` scores and compare windows
+            # Improving: compare the recent window with the previous one
             improving: List[tuple] = []  # (p, delta, recent_avg, prev_avg, n)
-            for p, n, _avg in agg:
-                cur.execute(
-                    """SELECT final_score FROM sessions
-                         WHERE child_id=? AND phoneme_target=? AND final_score IS NOT NULL
-                         ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC
-                         LIMIT ?""",
-                    (int(child_id), p, int(limit)),
-                )
-                vals = [float(x[0]) for x in cur.fetchall() if x[0] is not None]
-                if len(vals) < 10:
+            for p, n, _avg, recent_avg, n_recent, prev_avg, n_prev in rows:
+                if min(n, int(limit)) < 10 or n_recent < 5 or n_prev < 5:
                     continue
-                # Use half/half windows, falling back safely for small limits.
-                half = max(5, int(limit) // 2)
-                recent = vals[:half]
-                prev = vals[half: (2 * half)]
-                if len(recent) < 5 or len(prev) < 5:
-                    continue
-                recent_avg = sum(recent) / len(recent)
-                prev_avg = sum(prev) / len(prev)
                 delta = recent_avg - prev_avg
-                improving.append((p, delta, recent_avg, prev_avg, n))
+                improving.append((str(p), delta, recent_avg, prev_avg, n))
 
             improving.sort(key=lambda x: x[1], reverse=True)
             improving = [t for t in improving if t[1] > 0.01][:3]
@@ -636,23 +1172,23 @@ class DataLayer:
         import csv
         os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
 
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur, open(out_path, "w", newline="", encoding="utf-8") as f:
+            # Latest `limit` sessions, returned in chronological order and streamed
+            # from the cursor into the file.
             cur.execute(
-                """SELECT created_at, duration_sec, final_score, phoneme_target,
+                f"""SELECT created_at, duration_sec, final_score, phoneme_target,
                           plan_name, story_title, expected_text, recognized_text
-                   FROM sessions
-                   WHERE child_id=?
-                   ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC
-                   LIMIT ?""",
+                   FROM (
+                       SELECT id, {self._created_key} AS k, created_at, duration_sec, final_score, phoneme_target,
+                              plan_name, story_title, expected_text, recognized_text
+                       FROM sessions
+                       WHERE child_id=?
+                       ORDER BY {self._created_key} DESC
+                       LIMIT ?
+                   )
+                   ORDER BY k ASC, id ASC""",
                 (int(child_id), int(limit)),
             )
-            rows = cur.fetchall()
-
-        # Write in chronological order
-        rows = list(reversed(rows))
-
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
             w = csv.writer(f, delimiter=";")
             w.writerow([
                 "date",
@@ -664,17 +1200,19 @@ class DataLayer:
                 "expected_text",
                 "recognized_text",
             ])
-            for r in rows:
-                w.writerow([
+            w.writerows(
+                (
                     r[0] or "",
-                    ("{:.2f}".format(float(r[1] or 0.0))),
-                    ("{:.3f}".format(float(r[2] or 0.0))) if r[2] is not None else "",
+                    "{:.2f}".format(float(r[1] or 0.0)),
+                    "{:.3f}".format(float(r[2])) if r[2] is not None else "",
                     r[3] or "",
                     r[4] or "",
                     r[5] or "",
-                    (r[6] or "").replace("\n", " ").strip(),
-                    (r[7] or "").replace("\n", " ").strip(),
-                ])
+                    (r[6] or "").translate(_NEWLINES_TO_SPACE).strip(),
+                    (r[7] or "").translate(_NEWLINES_TO_SPACE).strip(),
+                )
+                for r in cur
+            )
         return out_path
 
 
@@ -690,31 +1228,34 @@ class DataLayer:
           ▼ if delta <= -0.05
           ■ otherwise
         """
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute("SELECT id, name, age, grade FROM children ORDER BY name COLLATE NOCASE")
             children = cur.fetchall()
 
+            # Last `limit_per_child` scores of every child, aggregated in one pass.
+            cur.execute(
+                """SELECT child_id,
+                          COUNT(*), AVG(s),
+                          AVG(CASE WHEN rn <= 10 THEN s END), COUNT(CASE WHEN rn <= 10 THEN 1 END),
+                          AVG(CASE WHEN rn > 10 AND rn <= 20 THEN s END), COUNT(CASE WHEN rn > 10 AND rn <= 20 THEN 1 END)
+                   FROM (
+                       SELECT child_id, final_score AS s,
+                              ROW_NUMBER() OVER (PARTITION BY child_id ORDER BY created_at DESC) AS rn
+                       FROM sessions
+                       WHERE final_score IS NOT NULL
+                   )
+                   WHERE rn <= ?
+                   GROUP BY child_id""",
+                (int(limit_per_child),),
+            )
+            stats = {int(r[0]): tuple(r[1:]) for r in cur.fetchall() if r[0] is not None}
+
             out: List[Dict[str, Any]] = []
             for c in children:
                 child_id = int(c["id"])
-                cur.execute(
-                    """SELECT final_score, duration_sec, created_at
-                       FROM sessions
-                       WHERE child_id=? AND final_score IS NOT NULL
-                       ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC
-                       LIMIT ?""",
-                    (child_id, int(limit_per_child)),
-                )
-                rows = cur.fetchall()
-                scores = [float(r[0]) for r in rows if r[0] is not None]
-                total_sessions = len(scores)
-                avg = (sum(scores) / total_sessions) if total_sessions else None
-
-                recent = scores[:10]
-                prev = scores[10:20]
-                recent_avg = (sum(recent) / len(recent)) if len(recent) >= 3 else None
-                prev_avg = (sum(prev) / len(prev)) if len(prev) >= 3 else None
+                total_sessions, avg, recent_avg, n_recent, prev_avg, n_prev = stats.get(child_id, (0, None, None, 0, None, 0))
+                recent_avg = recent_avg if n_recent >= 3 else None
+                prev_avg = prev_avg if n_prev >= 3 else None
                 delta = (recent_avg - prev_avg) if (recent_avg is not None and prev_avg is not None) else None
 
                 status = "■"
@@ -743,83 +1284,154 @@ class DataLayer:
     def add_child(self, name: str, age: Optional[int], sex: str, grade: str, avatar_bytes: Optional[bytes]=None) -> int:
         """Create a child profile.
 
-        7.8+: avatars are stored as BLOB in DB.
+        7.8+: avatars are stored as BLOB in DB (child_avatars table).
         7.9: avatar_path is deprecated (kept only for legacy DBs).
         """
+        blob = _as_blob(avatar_bytes)
+        ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
-            blob = None
-            try:
-                if avatar_bytes:
-                    blob = bytes(avatar_bytes)
-            except Exception:
-                blob = None
             cur.execute(
-                "INSERT INTO children(name, age, sex, grade, avatar_blob, created_at) VALUES(?,?,?,?,?,?)",
-                (name, age, sex, grade, sqlite3.Binary(blob) if blob else None, now_iso())
+                "INSERT INTO children(name, age, sex, grade, created_at) VALUES(?,?,?,?,?)",
+                (name, age, sex, grade, ts)
             )
-            self.conn.commit()
-            return cur.lastrowid
+            child_id = cur.lastrowid
+            self._set_avatar_locked(cur, child_id, blob)
+            self._commit()
+            return child_id
 
     def update_child(self, child_id: int, name: str, age: Optional[int], sex: str, grade: str, avatar_bytes: Optional[bytes]=None):
         """Update a child profile. Avatar stored as BLOB."""
+        blob = _as_blob(avatar_bytes)
         with self.lock:
             cur = self.conn.cursor()
-            blob = None
-            try:
-                if avatar_bytes:
-                    blob = bytes(avatar_bytes)
-            except Exception:
-                blob = None
             cur.execute(
-                "UPDATE children SET name=?, age=?, sex=?, grade=?, avatar_blob=? WHERE id=?",
-                (name, age, sex, grade, sqlite3.Binary(blob) if blob else None, child_id)
+                "UPDATE children SET name=?, age=?, sex=?, grade=? WHERE id=?",
+                (name, age, sex, grade, child_id)
             )
-            self.conn.commit()
+            self._set_avatar_locked(cur, child_id, blob)
+            self._commit()
+
+    @staticmethod
+    def _set_avatar_locked(cur: sqlite3.Cursor, child_id: int, blob: Optional[memoryview]) -> None:
+        if blob:
+            cur.execute(
+                "INSERT OR REPLACE INTO child_avatars(child_id, avatar_blob) VALUES(?,?)",
+                (child_id, blob)
+            )
+        else:
+            cur.execute("DELETE FROM child_avatars WHERE child_id=?", (child_id,))
 
     def delete_child(self, child_id: int):
         with self.lock:
             cur = self.conn.cursor()
+            cur.execute("DELETE FROM child_avatars WHERE child_id=?", (child_id,))
             cur.execute("DELETE FROM children WHERE id=?", (child_id,))
-            self.conn.commit()
+            self._commit()
 
     # --- sessions
-    def save_session(self, s: Dict[str, Any]) -> int:
-        cols = [
-            "created_at","child_id","story_id","story_title","goal","sentence_index",
-            "expected_text","recognized_text","wer","audio_path","duration_sec",
-            "phoneme_target","spectral_centroid_hz","phoneme_quality",
-            "features_json","acoustic_score","acoustic_contrast","final_score",
-            "phoneme_confidence","focus_start_sec","focus_end_sec",
-            "plan_id","plan_name","plan_mode","plan_json"
-        ]
+    def _session_cols(self) -> List[str]:
+        cols = list(_SESSION_INSERT_COLS)
 
         # Sprint 8: link item rows to a session_run when available
         try:
-            cur0 = self.conn.cursor()
-            if _column_exists(cur0, "sessions", "run_id") and "run_id" not in cols:
+            if self._has_column("sessions", "run_id") and "run_id" not in cols:
                 cols.append("run_id")
         except Exception:
             pass
-        values = [s.get(c) for c in cols]
-        with self.lock:
-            cur = self.conn.cursor()
-            cur.execute(
-                f"INSERT INTO sessions({','.join(cols)}) VALUES({','.join(['?']*len(cols))})",
-                values
+        return cols
+
+    def _session_insert_sql(self) -> str:
+        # Built once: sqlite3 reuses a compiled statement only for an identical SQL string.
+        if self._sql_insert_session is None:
+            cols = self._session_cols()
+            self._sql_insert_session = (
+                cols, f"INSERT INTO sessions({','.join(cols)}) VALUES({','.join(['?']*len(cols))})"
             )
-            self.conn.commit()
+        return self._sql_insert_session
+
+    def save_session(self, s: Dict[str, Any]) -> int:
+        """Insert one session row. Returns its id."""
+        cols, sql = self._session_insert_sql()
+        values = _session_values(s, cols)
+        with self.lock:
+            cur = self.conn.execute(sql, values)
+            self._commit()
+            self._count_session_writes(1)
             return cur.lastrowid
 
-    
+    def get_session_features(self, session_id: int) -> Dict[str, Any]:
+        """Return the acoustic features of a session (binary blob, else legacy JSON)."""
+        with self._reader(named=False) as cur:
+            cur.execute("SELECT features_blob, features_json FROM sessions WHERE id=?", (int(session_id),))
+            row = cur.fetchone()
+        if not row:
+            return {}
+        if row[0]:
+            return unpack_features(row[0])
+        try:
+            return _json_loads(row[1]) if row[1] else {}
+        except Exception:
+            return {}
+
+    def get_session_played_plan(self, session_id: int) -> Dict[str, Any]:
+        """Return the plan a session row was played with ({} if none)."""
+        with self._reader(named=False) as cur:
+            cur.execute("SELECT plan_blob, plan_json FROM sessions WHERE id=?", (int(session_id),))
+            row = cur.fetchone()
+        if not row:
+            return {}
+        try:
+            text = _unpack_text(row[0]) if row[0] else row[1]
+            return _json_loads(text) if text else {}
+        except Exception:
+            return {}
+
+    def session_batch(self, flush_every: int = 0) -> "SessionBatch":
+        """Open a buffer of session rows owned by the caller (see SessionBatch).
+
+        Other save_session() callers are not affected: they keep inserting
+        immediately.
+        """
+        return SessionBatch(self, flush_every)
+
+    def save_sessions(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert several session rows in one transaction. Returns their ids."""
+        if not rows:
+            return []
+        with self.lock:
+            return self._insert_sessions_locked(rows)
+
+    def _insert_sessions_locked(self, rows: List[Dict[str, Any]]) -> List[int]:
+        cols, sql = self._session_insert_sql()
+        try:
+            self.conn.executemany(sql, [_session_values(r, cols) for r in rows])
+            # The rows were inserted back to back by this transaction: ids are contiguous.
+            last = int(self.conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        self._count_session_writes(len(rows))
+        return list(range(last - len(rows) + 1, last + 1))
+
+    def _count_session_writes(self, n: int) -> None:
+        # Long-running instances: refresh planner stats as sessions grows,
+        # not only at close(). A no-op when nothing changed much.
+        self._writes_since_optimize += n
+        if self._writes_since_optimize >= _OPTIMIZE_EVERY:
+            self._writes_since_optimize = 0
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except Exception:
+                pass
 
     
     # --- session plans (Sprint 2)
     def list_session_plans(self) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute(
-                "SELECT id, name, plan_json, created_at, updated_at FROM session_plans ORDER BY datetime(REPLACE(updated_at,'T',' ')) DESC, id DESC"
+                "SELECT id, name, plan_json, created_at, updated_at FROM session_plans ORDER BY updated_at DESC, id DESC"
             )
             return cur.fetchall()
 
@@ -828,7 +1440,7 @@ class DataLayer:
         nm = (name or "").strip()
         if not nm:
             raise ValueError("Plan name is required")
-        pj = json.dumps(plan, ensure_ascii=False)
+        pj = _json_dumps(plan)
         ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
@@ -836,7 +1448,7 @@ class DataLayer:
                 "INSERT INTO session_plans(name, plan_json, created_at, updated_at) VALUES(?,?,?,?)",
                 (nm, pj, ts, ts)
             )
-            self.conn.commit()
+            self._commit()
             return cur.lastrowid
 
     
@@ -845,7 +1457,7 @@ class DataLayer:
         nm = (name or "").strip()
         if not nm:
             raise ValueError("Plan name is required")
-        pj = json.dumps(plan, ensure_ascii=False)
+        pj = _json_dumps(plan)
         ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
@@ -853,35 +1465,36 @@ class DataLayer:
                 "UPDATE session_plans SET name=?, plan_json=?, updated_at=? WHERE id=?",
                 (nm, pj, ts, int(plan_id))
             )
-            self.conn.commit()
+            self._commit()
     def delete_session_plan(self, plan_id: int) -> None:
             with self.lock:
                 cur = self.conn.cursor()
                 cur.execute("DELETE FROM session_plans WHERE id=?", (int(plan_id),))
-                self.conn.commit()
+                self._commit()
 
     def get_session_plan(self, plan_id: int) -> Optional[Dict[str, Any]]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             cur.execute("SELECT plan_json FROM session_plans WHERE id=?", (int(plan_id),))
             row = cur.fetchone()
             if not row:
                 return None
             try:
-                return json.loads(row[0])
+                return _json_loads(row[0])
             except Exception:
                 return None
 
     # --- session run summary (Sprint 2)
-    def create_session_run(self, child_id: int, plan: Dict[str, Any], planned_items: int) -> int:
-        pj = json.dumps(plan, ensure_ascii=False)
+    def create_session_run(self, child_id: int, plan: Optional[Dict[str, Any]], planned_items: int, *, plan_json: Optional[str] = None) -> int:
+        """Open a session run. Pass `plan_json` when the caller already holds the serialized plan."""
+        pj = plan_json if plan_json is not None else _json_dumps(plan or {})
+        ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
             cur.execute(
                 "INSERT INTO session_runs(created_at, child_id, plan_json, planned_items, completed_items, ended_early, early_end_reason) VALUES(?,?,?,?,?,?,?)",
-                (now_iso(), int(child_id), pj, int(planned_items), 0, 0, "")
+                (ts, int(child_id), pj, int(planned_items), 0, 0, "")
             )
-            self.conn.commit()
+            self._commit()
             return cur.lastrowid
 
     def finish_session_run(self, run_id: int, completed_items: int, ended_early: bool, reason: str = "") -> None:
@@ -891,74 +1504,132 @@ class DataLayer:
                 "UPDATE session_runs SET completed_items=?, ended_early=?, early_end_reason=? WHERE id=?",
                 (int(completed_items), 1 if ended_early else 0, (reason or ""), int(run_id))
             )
-            self.conn.commit()
-
-    def fetch_sessions_filtered(self, child_id: Optional[int]=None, phoneme_target: Optional[str]=None, limit: int=500):
-        with self.lock:
-            cur = self.conn.cursor()
-            order = "ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC, id DESC"
-
-            clauses = []
-            params = []
-            if child_id:
-                clauses.append("child_id=?")
-                params.append(child_id)
-            if phoneme_target and phoneme_target != "__ALL__":
-                clauses.append("COALESCE(phoneme_target,'')=?")
-                params.append(phoneme_target)
-
-            where = ("WHERE " + " AND ".join(clauses) + " ") if clauses else ""
-            params.append(limit)
-            cur.execute(f"SELECT * FROM sessions {where}{order} LIMIT ?", tuple(params))
-            return cur.fetchall()
-
+            self._commit()
 
+    def fetch_sessions_filtered(
+        self,
+        child_id: Optional[int]=None,
+        phoneme_target: Optional[str]=None,
+        limit: int=500,
+        before_created_at: Optional[str]=None,
+        before_id: Optional[int]=None,
+    ):
+        """Latest sessions first. Pass the created_at/id of the last row shown to
+        get the next (older) page without re-reading the previous ones."""
+        return list(self.iter_sessions_filtered(child_id, phoneme_target, limit, before_created_at, before_id))
+
+    def iter_sessions_filtered(
+        self,
+        child_id: Optional[int]=None,
+        phoneme_target: Optional[str]=None,
+        limit: int=500,
+        before_created_at: Optional[str]=None,
+        before_id: Optional[int]=None,
+    ) -> Iterator[sqlite3.Row]:
+        """Same rows as fetch_sessions_filtered, read _FETCH_BATCH at a time.
+
+        The read connection is held until the generator is exhausted or closed.
+        """
+        params = []
+        by_child = bool(child_id)
+        if by_child:
+            params.append(child_id)
+        by_phoneme = bool(phoneme_target and phoneme_target != "__ALL__")
+        if by_phoneme:
+            params.append(phoneme_target)
+        keyset = before_created_at is not None and before_id is not None
+        if keyset:
+            params.extend([before_created_at, int(before_id)])
+        params.append(limit)
+        sql = _sessions_filtered_sql(self._created_key, by_child, by_phoneme, keyset)
+        with self._reader() as cur:
+            cur.arraysize = _FETCH_BATCH
+            cur.execute(sql, tuple(params))
+            while True:
+                batch = cur.fetchmany()
+                if not batch:
+                    return
+                yield from batch
 
     def delete_sessions_by_ids(self, ids: List[int]):
         if not ids:
             return
+        ids = [int(i) for i in ids]
         with self.lock:
             cur = self.conn.cursor()
-            cur.executemany("DELETE FROM sessions WHERE id=?", [(i,) for i in ids])
-            self.conn.commit()
+            # One statement per chunk (bounded by SQLite's host-parameter limit).
+            for k in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[k:k + _IN_CHUNK]
+                cur.execute(f"DELETE FROM sessions WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            self._commit()
+            for i in ids:
+                self._audio_cache.pop(i, None)
 
     # --- reference profiles
     def save_reference_profile(self, child_id: Optional[int], phoneme: str, label: str, features: Dict[str, Any]):
+        # Serialize before taking the writer lock.
+        payload = _json_dumps(features)
+        ts = now_iso()
         with self.lock:
             cur = self.conn.cursor()
             cur.execute(
                 "INSERT INTO reference_profiles(child_id, phoneme, label, features_json, created_at) VALUES(?,?,?,?,?)",
-                (child_id, phoneme, label, json.dumps(features, ensure_ascii=False), now_iso())
+                (child_id, phoneme, label, payload, ts)
             )
-            self.conn.commit()
+            self._commit()
 
-    def load_reference_profile(self, child_id: Optional[int], phoneme: str, label: str) -> Optional[Dict[str, Any]]:
-        with self.lock:
-            cur = self.conn.cursor()
+    def _select_reference(self, expr: str, child_id: Optional[int], phoneme: str, label: str, args: tuple = ()):
+        """Fetch `expr` from the latest reference profile matching (child_id, phoneme, label)."""
+        with self._reader(named=False) as cur:
             if child_id is None:
                 cur.execute(
-                    "SELECT * FROM reference_profiles WHERE child_id IS NULL AND phoneme=? AND label=? ORDER BY created_at DESC LIMIT 1",
-                    (phoneme, label)
+                    f"SELECT {expr} FROM reference_profiles WHERE child_id IS NULL AND phoneme=? AND label=? ORDER BY created_at DESC LIMIT 1",
+                    args + (phoneme, label)
                 )
             else:
                 cur.execute(
-                    "SELECT * FROM reference_profiles WHERE child_id=? AND phoneme=? AND label=? ORDER BY created_at DESC LIMIT 1",
-                    (child_id, phoneme, label)
+                    f"SELECT {expr} FROM reference_profiles WHERE child_id=? AND phoneme=? AND label=? ORDER BY created_at DESC LIMIT 1",
+                    args + (child_id, phoneme, label)
                 )
-            row = cur.fetchone()
-            if not row:
-                return None
-            try:
-                return json.loads(row["features_json"])
-            except Exception:
-                return None
+            return cur.fetchone()
+
+    def load_reference_profile(self, child_id: Optional[int], phoneme: str, label: str) -> Optional[Dict[str, Any]]:
+        row = self._select_reference("features_json", child_id, phoneme, label)
+        if not row:
+            return None
+        try:
+            return _json_loads(row[0])
+        except Exception:
+            return None
+
+    def load_reference_feature(self, child_id: Optional[int], phoneme: str, label: str, key: str) -> Any:
+        """Return a single key of the reference profile, extracted by SQLite (JSON1)."""
+        if not _JSON_KEY_RE.fullmatch(key or ""):
+            # Quotes/backslashes would break the JSON path: look the key up in Python.
+            ref = self.load_reference_profile(child_id, phoneme, label)
+            return ref.get(key) if ref else None
+        try:
+            path = '$."%s"' % key
+            row = self._select_reference(
+                "json_extract(features_json, ?), json_type(features_json, ?)",
+                child_id, phoneme, label, (path, path),
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without JSON1
+            ref = self.load_reference_profile(child_id, phoneme, label)
+            return ref.get(key) if ref else None
+        if not row:
+            return None
+        # json_extract returns arrays/objects as JSON text
+        if row[1] in ("array", "object"):
+            return _json_loads(row[0])
+        return row[0]
 
 
     # --- Sprint 8: exercises -------------------------------------------------
 
     def list_exercises(self, q: str = "", objective: str = "", level: Optional[int] = None, typ: str = "") -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             sql = "SELECT id,title,text,type,objective,level,voice,rate,pause_ms,created_at,updated_at FROM exercises WHERE 1=1"
             args: List[Any] = []
             if q:
@@ -999,7 +1670,7 @@ class DataLayer:
                     ts, ts
                 )
             )
-            self.conn.commit()
+            self._commit()
             return cur.lastrowid
 
     def update_exercise(self, ex_id: int, data: Dict[str, Any]) -> None:
@@ -1021,13 +1692,13 @@ class DataLayer:
                     int(ex_id)
                 )
             )
-            self.conn.commit()
+            self._commit()
 
     def delete_exercise(self, ex_id: int) -> None:
         with self.lock:
             cur = self.conn.cursor()
             cur.execute("DELETE FROM exercises WHERE id=?", (int(ex_id),))
-            self.conn.commit()
+            self._commit()
 
     def import_exercises_csv(self, path: str, delimiter: Optional[str] = None) -> Dict[str, Any]:
         """Import CSV with tolerant parsing. Expected columns: title,text,type,objective,level,(voice,rate,pause_ms)."""
@@ -1071,34 +1742,30 @@ class DataLayer:
     # --- Sprint 8: history ---------------------------------------------------
 
     def list_session_runs_for_child(self, child_id: int, limit: int = 50) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader() as cur:
             cur.execute(
-                "SELECT id, created_at, planned_items, completed_items, ended_early, early_end_reason, plan_json FROM session_runs WHERE child_id=? ORDER BY datetime(REPLACE(created_at,'T',' ')) DESC, id DESC LIMIT ?",
+                "SELECT id, created_at, planned_items, completed_items, ended_early, early_end_reason, plan_json FROM session_runs WHERE child_id=? ORDER BY created_at DESC, id DESC LIMIT ?",
                 (int(child_id), int(limit))
             )
             return cur.fetchall()
 
     def list_sessions_for_run(self, run_id: int) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
-            if _column_exists(cur, "sessions", "run_id"):
-                cur.execute(
-                    "SELECT id, created_at, expected_text, recognized_text, final_score, wer, audio_path FROM sessions WHERE run_id=? ORDER BY id ASC",
-                    (int(run_id),)
-                )
-                return cur.fetchall()
+        if not self._has_column("sessions", "run_id"):
             return []
+        with self._reader() as cur:
+            cur.execute(
+                "SELECT id, created_at, expected_text, recognized_text, final_score, wer, audio_path FROM sessions WHERE run_id=? ORDER BY id ASC",
+                (int(run_id),)
+            )
+            return cur.fetchall()
 
     def list_grades(self) -> List[str]:
-        with self.lock:
-            cur = self.conn.cursor()
+        with self._reader(named=False) as cur:
             cur.execute("SELECT DISTINCT grade FROM children WHERE grade IS NOT NULL AND TRIM(grade)<>'' ORDER BY grade ASC")
             return [str(r[0]) for r in cur.fetchall()]
 
     def list_children_by_grade(self, grade: str) -> List[sqlite3.Row]:
-        with self.lock:
-            cur = self.conn.cursor()
-            cur.execute("SELECT id,name,age,sex,grade,avatar_blob,created_at FROM children WHERE grade=? ORDER BY name ASC", (str(grade),))
+        with self._reader() as cur:
+            cur.execute("SELECT id,name,age,sex,grade,created_at FROM children WHERE grade=? ORDER BY name ASC", (str(grade),))
             return cur.fetchall()
 
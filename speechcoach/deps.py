@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from importlib.util import find_spec
 from typing import Dict, Tuple
 
 def _check(mod: str) -> Tuple[bool, str]:
+    # Locate the module without importing it (faster_whisper would load its
+    # inference runtime just to answer "installed?").
     try:
-        __import__(mod)
-        return True, ""
+        spec = find_spec(mod)
     except Exception as e:
         return False, str(e)
+    return (spec is not None, "" if spec is not None else "not found")
 
 def check_dependencies() -> Dict[str, Tuple[bool, str]]:
     """Return dependency status for optional/critical modules.
@@ -1,4 +1,3 @@
-import json
 import os
 import threading
 import time
@@ -10,12 +9,17 @@ from typing import Callable, Optional
 from .analysis import (
     acoustic_score_from_features,
     extract_features,
+    extract_features_from_array,
     final_score_v71,
     find_focus_window,
     phoneme_confidence_score,
+    vectorize_features,
 )
+from .asr import StreamingTranscriber
+from .utils_features import pack_features
 from .utils_text import now_iso, pedagogic_wer
 from .config import AUDIO_DIR
+from .db import _json_dumps, _pack_text
 from .models import Story, StorySentence
 
 
@@ -66,6 +70,8 @@ class GameController:
 
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Signaled by toggle_pause()/stop() so a paused run wakes up immediately.
+        self._pause_cv = threading.Condition()
 
         self.last_phrase: Optional[str] = None
         self.last_final_score: float = 0.0
@@ -134,15 +140,6 @@ class GameController:
         if story is None:
             raise ValueError("Impossible de sélectionner une story.")
 
-        # Sprint 8: create a session_run for history grouping (best effort)
-        self._run_id = None
-        try:
-            if self.child_id is not None and plan is not None:
-                planned = int(rounds)
-                self._run_id = self.dl.create_session_run(int(self.child_id), getattr(plan, "to_json_dict", lambda: {})(), planned)
-        except Exception:
-            self._run_id = None
-
         self._thread = threading.Thread(
             target=self._run,
             args=(story, int(rounds), plan),
@@ -155,23 +152,25 @@ class GameController:
             return
         self.state = GameState.STOPPING
         self._stop_event.set()
+        with self._pause_cv:
+            self._pause_cv.notify_all()
 
     def toggle_pause(self):
         # Keep track of the previous active state so resume returns to the right phase.
-        if self.state == GameState.PAUSED:
-            self.state = getattr(self, '_paused_prev_state', GameState.PLAYING) or GameState.PLAYING
-            self._status("▶️ Reprise")
-        elif self.state in (GameState.PLAYING, GameState.LISTENING, GameState.ANALYZING):
-            self._paused_prev_state = self.state
-            self.state = GameState.PAUSED
-            self._status("⏸️ Pause")
+        with self._pause_cv:
+            if self.state == GameState.PAUSED:
+                self.state = getattr(self, '_paused_prev_state', GameState.PLAYING) or GameState.PLAYING
+                self._pause_cv.notify_all()
+                self._status("▶️ Reprise")
+            elif self.state in (GameState.PLAYING, GameState.LISTENING, GameState.ANALYZING):
+                self._paused_prev_state = self.state
+                self.state = GameState.PAUSED
+                self._status("⏸️ Pause")
 
     def replay_last(self):
+        # Go through the serialized TTS queue: a replay must not overlap the session's speech.
         if self.last_phrase:
-            threading.Thread(
-                target=lambda: self.audio.tts.speak(self.last_phrase),
-                daemon=True
-            ).start()
+            self.audio.tts.say(self.last_phrase)
 
     # ==========================================================
     # CORE LOOP
@@ -229,7 +228,11 @@ class GameController:
 
     def _run(self, story, rounds: int, plan=None):
 
+        batch = None
+        run_id = None
         try:
+            # Round rows of this run are written together, every 5 rounds and at the end.
+            batch = self.dl.session_batch(flush_every=5)
             self.state = GameState.PLAYING
             self._status("🎮 Session démarrée")
 
@@ -238,18 +241,32 @@ class GameController:
                 time.sleep(0.5)
 
             seq = self._build_turn_sequence(story, rounds, plan)
+
+            # One timestamp per run; the round index keeps file names unique.
+            wav_prefix = os.path.join(AUDIO_DIR, f"{self.child_id}_{story.story_id}_{int(time.time())}_")
+
+            # Reference profiles don't change during a run: load + vectorize them once.
+            ref_vecs = {}
+            for st in story.sentences or []:
+                self._reference_vector(ref_vecs, st.phoneme_target, "target")
+                self._reference_vector(ref_vecs, st.phoneme_contrast, "contrast")
             total = len(seq)
             # Minimal adaptation counters (repeat-on-fail)
             repeats = {}
 
-            # Sprint 2: session-run summary
-            run_id = None
+            # Serialized once: reused by the run row and every round row.
+            plan_json = _json_dumps(getattr(plan, "to_json_dict", lambda: {})()) if plan else None
+            # Round rows store it compressed: pack it once too, not per row.
+            plan_blob = _pack_text(plan_json)
+
+            # Sprint 2/8: session-run summary; its id groups the round rows in the history.
             try:
                 if plan is not None and self.child_id is not None:
                     run_id = self.dl.create_session_run(
                         child_id=int(self.child_id),
-                        plan=getattr(plan, "to_json_dict", lambda: {})(),
+                        plan=None,
                         planned_items=int(total),
+                        plan_json=plan_json,
                     )
             except Exception:
                 run_id = None
@@ -266,8 +283,7 @@ class GameController:
                     self.last_end_reason = "stopped"
                     break
 
-                while self.state == GameState.PAUSED:
-                    time.sleep(0.1)
+                self._wait_if_paused()
 
                 sent = story.sentences[sent_idx % len(story.sentences)]
                 expected = sent.text
@@ -294,33 +310,54 @@ class GameController:
                     pass
                 self._status("🎙️ Prêt ? Répète la phrase quand tu veux !")
 
-                wav_path = os.path.join(
-                    AUDIO_DIR,
-                    f"{self.child_id}_{story.story_id}_{int(time.time())}_{i+1}.wav"
-                )
+                wav_path = wav_prefix + f"{i+1}.wav"
 
                 # ---- RECORD (robust)
                 # Sur certains micros/drivers, le tout premier enregistrement peut être
                 # trop court (stop_event, init stream, bruit). On retente une fois.
+                # Whisper runs on completed segments while the child is still speaking.
                 dur, thr = 0.0, 0.0
-                for attempt in range(2):
-                    if self._stop_event.is_set():
-                        break
-                    cur_path = wav_path if attempt == 0 else wav_path.replace(".wav", f"_retry{attempt}.wav")
-                    dur, thr = self.audio.record_until_silence_rms(
-                        cur_path,
-                        stop_event=self._stop_event
-                    )
-                    wav_path = cur_path
-                    if dur >= 0.35:
-                        break
-                    # feedback + petit délai pour stabiliser
-                    self._status("🎙️ Trop court, on recommence")
-                    try:
-                        self.audio.tts.speak("On recommence")
-                    except Exception:
-                        pass
-                    time.sleep(0.2)
+                streamer = None
+                take = []
+                try:
+                    for attempt in range(2):
+                        if self._stop_event.is_set():
+                            break
+                        if streamer is not None:
+                            streamer.cancel()
+                        streamer = StreamingTranscriber(self.asr, self.audio.sample_rate)
+                        # Keep the take in memory too: analysis then skips re-reading the WAV.
+                        take = []
+
+                        def _on_chunk(x, is_speech, _feed=streamer.feed, _take=take):
+                            _take.append(x)
+                            _feed(x, is_speech)
+
+                        cur_path = wav_path if attempt == 0 else wav_path.replace(".wav", f"_retry{attempt}.wav")
+                        dur, thr = self.audio.record_until_silence_rms(
+                            cur_path,
+                            stop_event=self._stop_event,
+                            on_chunk=_on_chunk,
+                        )
+                        wav_path = cur_path
+                        if dur >= 0.35:
+                            break
+                        # feedback + petit délai pour stabiliser
+                        self._status("🎙️ Trop court, on recommence")
+                        try:
+                            self.audio.tts.speak("On recommence")
+                        except Exception:
+                            pass
+                        time.sleep(0.2)
+                except BaseException:
+                    # e.g. device error: don't leave the worker blocked on its queue
+                    if streamer is not None:
+                        streamer.cancel()
+                    raise
+
+                if self._stop_event.is_set() or dur < 0.35:
+                    if streamer is not None:
+                        streamer.cancel()
 
                 if self._stop_event.is_set():
                     self.last_end_reason = "stopped"
@@ -340,21 +377,24 @@ class GameController:
                 self.state = GameState.ANALYZING
                 self._status("🧠 Analyse en cours")
 
-                rec_text, words = self.asr.transcribe_words(wav_path)
+                rec_text, words = streamer.finish() if streamer is not None else ("", [])
+                # An empty streamed result is trusted (silence/mumbling): re-reading the
+                # WAV only helps when nothing could be streamed at all.
+                if streamer is None or not streamer.submitted:
+                    rec_text, words = self.asr.transcribe_words(wav_path)
                 w = pedagogic_wer(expected, rec_text)
 
                 fs, fe = find_focus_window(words, sent.target_word)
-                feat = extract_features(wav_path, fs, fe)
+                if take:
+                    feat = extract_features_from_array(take, self.audio.sample_rate, fs, fe)
+                else:
+                    feat = extract_features(wav_path, fs, fe)
 
-                ref_target = self.dl.load_reference_profile(
-                    self.child_id, sent.phoneme_target, "target"
-                )
-                ref_contrast = self.dl.load_reference_profile(
-                    self.child_id, sent.phoneme_contrast, "contrast"
-                )
+                ref_target = self._reference_vector(ref_vecs, sent.phoneme_target, "target")
+                ref_contrast = self._reference_vector(ref_vecs, sent.phoneme_contrast, "contrast")
 
-                a_score = acoustic_score_from_features(feat, ref_target) if ref_target else 0.0
-                a_contrast = acoustic_score_from_features(feat, ref_contrast) if ref_contrast else 0.0
+                a_score = acoustic_score_from_features(feat, ref_target) if ref_target is not None else 0.0
+                a_contrast = acoustic_score_from_features(feat, ref_contrast) if ref_contrast is not None else 0.0
                 conf = phoneme_confidence_score(a_score, a_contrast)
                 final = final_score_v71(w, a_score)
                 try:
@@ -377,8 +417,15 @@ class GameController:
                 except Exception:
                     pass
 
+                # Synthesize the next sentence (as decided above) while this round is saved.
+                if i + 1 < total:
+                    try:
+                        self.audio.tts.prefetch(story.sentences[seq[i + 1] % len(story.sentences)].text)
+                    except Exception:
+                        pass
+
 
-                self.dl.save_session({
+                batch.add({
                     "created_at": now_iso(),
                     "child_id": self.child_id,
                     "story_id": story.story_id,
@@ -387,8 +434,8 @@ class GameController:
                     "plan_id": getattr(plan, "plan_id", None),
                     "plan_name": getattr(plan, "name", None),
                     "plan_mode": getattr(plan, "mode", None),
-                    "plan_json": json.dumps(getattr(plan, "to_json_dict", lambda: {})(), ensure_ascii=False) if plan else None,
-                    "run_id": getattr(self, "_run_id", None),
+                    "plan_blob": plan_blob,
+                    "run_id": run_id,
                     "sentence_index": i,
                     "expected_text": expected,
                     "recognized_text": rec_text,
@@ -398,7 +445,7 @@ class GameController:
                     "phoneme_target": sent.phoneme_target,
                     "spectral_centroid_hz": feat.get("centroid", 0.0),
                     "phoneme_quality": a_score,
-                    "features_json": json.dumps(feat, ensure_ascii=False),
+                    "features_blob": pack_features(feat),
                     "acoustic_score": a_score,
                     "acoustic_contrast": a_contrast,
                     "final_score": final,
@@ -448,7 +495,7 @@ class GameController:
                                     rec2, w2, dur2 = self.asr.recognize_wav(wav2, expected_text=sent2.text)
                                     # We store it as a regular session row as well
                                     try:
-                                        self.dl.save_session({
+                                        batch.add({
                                             "created_at": now_iso(),
                                             "child_id": self.child_id,
                                             "story_id": story.story_id,
@@ -457,8 +504,8 @@ class GameController:
                                             "plan_id": getattr(plan, "plan_id", None),
                                             "plan_name": getattr(plan, "name", None),
                                             "plan_mode": getattr(plan, "mode", None),
-                                            "plan_json": json.dumps(getattr(plan, "to_json_dict", lambda: {})(), ensure_ascii=False) if plan else None,
-                    "run_id": getattr(self, "_run_id", None),
+                                            "plan_blob": plan_blob,
+                                            "run_id": run_id,
                                             "sentence_index": i,
                                             "expected_text": sent2.text,
                                             "recognized_text": rec2 or "",
@@ -511,6 +558,16 @@ class GameController:
             self._status(f"❌ Erreur: {e}")
 
         finally:
+            # Stop/fatigue/error: the prefetched next sentence will not be spoken.
+            try:
+                self.audio.tts.discard_prefetched()
+            except Exception:
+                pass
+            try:
+                if batch is not None:
+                    batch.close()
+            except Exception:
+                logger.exception("session batch flush failed")
             try:
                 if run_id is not None:
                     self.dl.finish_session_run(run_id, completed_items=int(locals().get('completed_items', 0) or 0), ended_early=bool(locals().get('ended_early', False)), reason=str(self.last_end_reason or ''))
@@ -525,6 +582,25 @@ class GameController:
     # UTILS
     # ==========================================================
 
+    def _wait_if_paused(self):
+        with self._pause_cv:
+            while self.state == GameState.PAUSED and not self._stop_event.is_set():
+                self._pause_cv.wait(timeout=1.0)
+
+    def _reference_vector(self, cache: dict, phoneme: str, label: str):
+        """Return the vectorized reference profile for (phoneme, label), memoized in `cache`."""
+        key = (phoneme or "", label)
+        if key not in cache:
+            vec = None
+            try:
+                ref = self.dl.load_reference_profile(self.child_id, phoneme, label)
+                if ref:
+                    vec = vectorize_features(ref)
+            except Exception:
+                vec = None
+            cache[key] = vec
+        return cache[key]
+
     def _dispatch(self, fn):
         if fn:
             self.ui_dispatch(fn)
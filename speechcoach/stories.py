@@ -1,7 +1,9 @@
 import json
 import os
 import random
+from bisect import bisect_left
 from collections import Counter, deque
+from itertools import accumulate
 from typing import List, Optional
 
 from .models import Story, StorySentence
@@ -75,13 +77,14 @@ class StoryEngine:
             sentences=sentences,
         )
 
-    def _score_story(self, story: Story) -> float:
+    def _score_story(self, story: Story, recent_counts: Optional[Counter] = None) -> float:
         w = max(0.05, float(story.weight))
         if story.story_id in self.recent_story_ids:
             w *= 0.25
 
         phon = (story.sentences[0].phoneme_target if story.sentences else "").upper()
-        recent_counts = Counter([p.upper() for p in self.recent_phonemes if p])
+        if recent_counts is None:
+            recent_counts = self._recent_phoneme_counts()
         if phon:
             w *= (0.85 ** recent_counts.get(phon, 0))
 
@@ -91,19 +94,17 @@ class StoryEngine:
         w *= random.uniform(0.80, 1.20)
         return max(0.01, w)
 
+    def _recent_phoneme_counts(self) -> Counter:
+        return Counter([p.upper() for p in self.recent_phonemes if p])
+
     def pick(self) -> Optional[Story]:
         if not self.stories:
             return None
-        weights = [self._score_story(s) for s in self.stories]
-        total = sum(weights)
+        recent_counts = self._recent_phoneme_counts()
+        cum = list(accumulate(self._score_story(s, recent_counts) for s in self.stories))
+        total = cum[-1]
         r = random.uniform(0, total) if total > 0 else 0.0
-        acc = 0.0
-        chosen = self.stories[-1]
-        for st, w in zip(self.stories, weights):
-            acc += w
-            if acc >= r:
-                chosen = st
-                break
+        chosen = self.stories[min(bisect_left(cum, r), len(self.stories) - 1)]
         self.recent_story_ids.append(chosen.story_id)
         phon = (chosen.sentences[0].phoneme_target if chosen.sentences else "")
         if phon:
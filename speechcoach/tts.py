@@ -1,14 +1,14 @@
 # speechcoach/tts.py
 import os
+import hashlib
 import platform
 import subprocess
 import threading
 import queue
 import logging
-from typing import Optional, Dict, Any, List
-
-import soundfile as sf
-import sounddevice as sd
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 
 logger = logging.getLogger("speechcoach.tts")
 log = logging.getLogger(__name__)
@@ -108,6 +108,25 @@ def list_edge_voices(locale_prefix: str = "fr-") -> List[str]:
         return []
 
 
+def _remove_quietly(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _discard_prefetched(fut: "Future") -> None:
+    """Cancel a prefetch that will never be played, or delete its mp3 once it completes."""
+    if fut.cancel():
+        return
+    def _cleanup(f):
+        try:
+            _remove_quietly(f.result())
+        except Exception:
+            pass
+    fut.add_done_callback(_cleanup)
+
 def _speak_edge_tts_to_mp3(text: str, voice: str, out_path: str, timeout_sec: int = 30) -> bool:
     """
     Edge Neural TTS via CLI, MP3 output (edge-tts 7.2.7 compatible).
@@ -231,6 +250,11 @@ class TTSEngine:
         self._tts_worker = threading.Thread(target=self._tts_loop, daemon=True)
         self._tts_worker.start()
 
+        # Edge synthesis ahead of playback (see prefetch): (voice, text) -> Future[path]
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-prefetch")
+        self._prefetched: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+
     # ---------- basic settings ----------
     def set_rate(self, rate: int):
         self.rate = int(rate)
@@ -291,6 +315,9 @@ class TTSEngine:
     def _play_audio_file(self, path: str) -> bool:
         """Play an audio file (mp3/wav/...) using soundfile + sounddevice."""
         try:
+            import soundfile as sf
+            import sounddevice as sd
+
             data, sr = sf.read(path, dtype="float32")
             sd.play(data, sr)
             sd.wait()
@@ -300,8 +327,59 @@ class TTSEngine:
             logger.warning("PLAY failed path=%s err=%s", path, e)
             return False
 
+    def prefetch(self, text: str) -> Optional[Future]:
+        """Synthesize `text` in background so a later speak(text) only has to play it.
+
+        Only the edge backend has a separate synthesis step; for the system
+        backend (synthesis == playback) this is a no-op returning None.
+        """
+        text = (text or "").strip()
+        if not text or (self.backend or "system") != "edge":
+            return None
+        key = (self.edge_voice, text)
+        with self._prefetch_lock:
+            fut = self._prefetched.get(key)
+            if fut is None:
+                fut = self._prefetch_pool.submit(self._synth_edge_mp3, key[0], text)
+                self._prefetched[key] = fut
+                while len(self._prefetched) > 8:
+                    _discard_prefetched(self._prefetched.popitem(last=False)[1])
+            return fut
+
+    def discard_prefetched(self) -> None:
+        """Drop every pending prefetch (end of session): queued synthesis is
+        cancelled, finished mp3s are deleted."""
+        with self._prefetch_lock:
+            futs = list(self._prefetched.values())
+            self._prefetched.clear()
+        for fut in futs:
+            _discard_prefetched(fut)
+
+    def _synth_edge_mp3(self, voice: str, text: str) -> Optional[str]:
+        try:
+            from .config import AUDIO_DIR
+            digest = hashlib.md5(f"{voice}|{text}".encode("utf-8")).hexdigest()[:16]
+            out_path = os.path.join(AUDIO_DIR, f"edge_tts_{digest}.mp3")
+            return out_path if _speak_edge_tts_to_mp3(text, voice, out_path) else None
+        except Exception as e:
+            logger.warning("EDGE prefetch failed: %s", e)
+            return None
+
     def _speak_edge_mp3(self, text: str) -> bool:
         """Generate Edge mp3 and play it. Returns True if spoken."""
+        with self._prefetch_lock:
+            fut = self._prefetched.pop((self.edge_voice, (text or "").strip()), None)
+        if fut is not None:
+            try:
+                path = fut.result(timeout=30)
+            except Exception:
+                path = None
+            if path:
+                try:
+                    return self._play_audio_file(path)
+                finally:
+                    _remove_quietly(path)
+
         try:
             from pathlib import Path
             from .config import AUDIO_DIR
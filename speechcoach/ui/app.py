@@ -18,6 +18,7 @@ from speechcoach.settings import SettingsManager
 from speechcoach.stories import StoryEngine
 from speechcoach.audio import AudioEngine
 from speechcoach.asr import ASREngine
+from speechcoach.analysis import warmup as analysis_warmup
 from speechcoach.game import GameController
 from speechcoach.session_manager import build_session_plan, get_preset_plan, preset_plans
 from speechcoach.rewards import load_catalog, choose_new_card_for_child
@@ -113,6 +114,18 @@ class SpeechCoachApp(tk.Tk):
         except Exception:
             pass
 
+        # librosa is imported lazily: warm it up once the UI is built.
+        try:
+            threading.Thread(target=analysis_warmup, daemon=True).start()
+        except Exception:
+            pass
+
+        # Whisper model: loaded once here, not by each ASREngine.
+        try:
+            threading.Thread(target=self.asr.warmup, daemon=True).start()
+        except Exception:
+            pass
+
         self.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def on_close(self):
@@ -879,18 +892,21 @@ class SpeechCoachApp(tk.Tk):
                 and getattr(self.game, 'last_end_reason', '') == 'finished'
                 and self.current_child_id
             ):
-                # Update progress (adaptive XP/level/streak)
-                prog = self.dl.upsert_progress_after_session(int(self.current_child_id), float(getattr(self.game, "last_final_score", 0.0) or 0.0))
-                level = int(prog["level"] or 1) if prog else 1
-
-                owned_ids = self.dl.list_owned_card_ids(int(self.current_child_id))
-                card = choose_new_card_for_child(
-                    catalog=getattr(self, "cards_catalog", []) or [],
-                    owned_card_ids=owned_ids,
-                    child_level=level,
-                )
-
-                if card is not None and self.dl.add_child_card_v2(int(self.current_child_id), card):
+                # Progress + card reward: one commit for both writes.
+                with self.dl.transaction():
+                    # Update progress (adaptive XP/level/streak)
+                    prog = self.dl.upsert_progress_after_session(int(self.current_child_id), float(getattr(self.game, "last_final_score", 0.0) or 0.0))
+                    level = int(prog["level"] or 1) if prog else 1
+
+                    owned_ids = self.dl.list_owned_card_ids(int(self.current_child_id))
+                    card = choose_new_card_for_child(
+                        catalog=getattr(self, "cards_catalog", []) or [],
+                        owned_card_ids=owned_ids,
+                        child_level=level,
+                    )
+                    got_card = card is not None and self.dl.add_child_card_v2(int(self.current_child_id), card)
+
+                if got_card:
                     self._show_card_reward(card, prog)
                 else:
                     # Collection complete for eligible cards (or insert ignored)
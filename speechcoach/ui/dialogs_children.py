@@ -78,7 +78,7 @@ class ChildManagerDialog(tk.Toplevel):
     def refresh(self):
         for i in self.tree.get_children():
             self.tree.delete(i)
-        for r in self.dl.list_children():
+        for r in self.dl.list_children(with_avatar=True):
             # sqlite3.Row behaves like a mapping but has no .get()
             avatar_path = ""
             avatar_blob = None
@@ -9,6 +9,9 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 class DashboardDialog(tk.Toplevel):
+    # Above this many sessions the evolution chart plots daily means.
+    MAX_PLOT_POINTS = 300
+
     def __init__(self, master, dl, audio, child_id: Optional[int], on_pick=None):
         super().__init__(master)
         self.on_pick = on_pick
@@ -222,7 +225,7 @@ class DashboardDialog(tk.Toplevel):
         self._sort_cache.clear()
 
         # ---- Fetch & render
-        rows = self.dl.fetch_sessions_filtered(child_id=sel_child_id, phoneme_target=sel_ph, limit=800)
+        rows = self.dl.iter_sessions_filtered(child_id=sel_child_id, phoneme_target=sel_ph, limit=800)
         for r in rows:
             session_id = self._safe_int(r["id"])
             child_id = self._safe_int(r["child_id"])
@@ -369,15 +372,14 @@ class DashboardDialog(tk.Toplevel):
 
         # Fetch from DB (source of truth)
         try:
-            rows = self.dl.fetch_sessions_filtered(limit=1000)
+            for r in self.dl.iter_sessions_filtered(limit=1000):
+                try:
+                    if int(r["id"]) == session_id:
+                        return dict(r)
+                except Exception:
+                    continue
         except Exception:
             return None
-        for r in rows:
-            try:
-                if int(r["id"]) == session_id:
-                    return dict(r)
-            except Exception:
-                continue
         return None
 
     def _on_row_double_click(self, _event=None):
@@ -448,8 +450,15 @@ class DashboardDialog(tk.Toplevel):
             self.canvas.draw()
             return
 
+        # Long histories: one point per day (mean score) rather than one per session.
+        per_day = False
         try:
-            series = self.dl.get_score_series(int(child_id), phoneme)
+            binned = self.dl.get_score_series_binned(int(child_id), phoneme)
+            if sum(n for _, _, n in binned) > self.MAX_PLOT_POINTS:
+                series = [(day, avg) for day, avg, _ in binned]
+                per_day = True
+            else:
+                series = self.dl.get_score_series(int(child_id), phoneme)
         except Exception:
             series = []
 
@@ -480,7 +489,7 @@ class DashboardDialog(tk.Toplevel):
             self.ax.plot(list(range(1, len(ys)+1)), ys, marker="o")
 
         ph = phoneme if phoneme and phoneme != "Tous" else "Tous"
-        self.ax.set_title(f"Évolution du score — Phonème: {ph}")
+        self.ax.set_title(f"Évolution du score — Phonème: {ph}" + (" (moyenne par jour)" if per_day else ""))
         self.ax.set_xlabel("Observation")
         self.ax.set_ylabel("Score final")
         self.canvas.draw()
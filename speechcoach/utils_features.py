@@ -0,0 +1,39 @@
+"""Compact binary encoding of acoustic feature dicts (sessions.features_blob).
+
+Layout (little-endian): version u8, n_mfcc u8, then float32 values
+mfcc_mean[n_mfcc], zcr, rms, centroid, rolloff, sr, dur_sec.
+A missing scalar is stored as NaN and left out when decoding.
+"""
+
+import math
+import struct
+from typing import Any, Dict, Optional
+
+FEATURES_BLOB_VERSION = 1
+
+_SCALARS = ("zcr", "rms", "centroid", "rolloff", "sr", "dur_sec")
+_HEADER = struct.Struct("<BB")
+
+def pack_features(feat: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    if not feat:
+        return None
+    mm = list(feat.get("mfcc_mean") or [])[:255]
+    vals = [float(x) for x in mm]
+    vals += [float(feat[k]) if feat.get(k) is not None else math.nan for k in _SCALARS]
+    return _HEADER.pack(FEATURES_BLOB_VERSION, len(mm)) + struct.pack(f"<{len(vals)}f", *vals)
+
+def unpack_features(blob: Optional[bytes]) -> Dict[str, Any]:
+    if not blob or len(blob) < _HEADER.size:
+        return {}
+    version, n_mfcc = _HEADER.unpack_from(blob)
+    if version != FEATURES_BLOB_VERSION:
+        return {}
+    n = n_mfcc + len(_SCALARS)
+    if len(blob) < _HEADER.size + 4 * n:
+        return {}
+    vals = struct.unpack_from(f"<{n}f", blob, _HEADER.size)
+    out: Dict[str, Any] = {"mfcc_mean": list(vals[:n_mfcc])}
+    for k, v in zip(_SCALARS, vals[n_mfcc:]):
+        if not math.isnan(v):
+            out[k] = int(v) if k == "sr" else v
+    return out
@@ -1,4 +1,10 @@
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+except Exception:
+    _rf_levenshtein = None
 
 try:
     from jiwer import wer as jiwer_wer
@@ -8,25 +14,27 @@ except Exception:
 def now_iso() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Single-pass character mapping (was one str.replace per entry).
+_NORMALIZE_TABLE = str.maketrans({
+    "’": "'",
+    "œ": "oe",
+    "æ": "ae",
+    "-": " ",
+    ",": " ",
+    ";": " ",
+    ":": " ",
+    "!": " ",
+    "?": " ",
+    ".": " ",
+    "…": " ",
+})
+
+# Expected sentences repeat across rounds/sessions: memoize.
+@lru_cache(maxsize=1024)
 def normalize_text_fr(s: str) -> str:
     if not s:
         return ""
-    s = s.lower().strip()
-    repl = {
-        "’": "'",
-        "œ": "oe",
-        "æ": "ae",
-        "-": " ",
-        ",": " ",
-        ";": " ",
-        ":": " ",
-        "!": " ",
-        "?": " ",
-        ".": " ",
-        "…": " ",
-    }
-    for k, v in repl.items():
-        s = s.replace(k, v)
+    s = s.lower().strip().translate(_NORMALIZE_TABLE)
     return " ".join(s.split())
 
 def pedagogic_wer(expected: str, recognized: str) -> float:
@@ -34,6 +42,10 @@ def pedagogic_wer(expected: str, recognized: str) -> float:
     rec = normalize_text_fr(recognized)
     if not exp and not rec:
         return 0.0
+    if _rf_levenshtein is not None and exp:
+        # Word-level edit distance (C++), same definition as jiwer's WER.
+        ref = exp.split()
+        return float(_rf_levenshtein.distance(ref, rec.split())) / len(ref)
     if jiwer_wer is None:
         return 1.0 if exp != rec else 0.0
     return float(jiwer_wer(exp, rec))
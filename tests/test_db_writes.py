@@ -0,0 +1,231 @@
+import sqlite3
+import threading
+
+import pytest
+
+from speechcoach.db import DataLayer
+
+
+@pytest.fixture
+def dl(tmp_path):
+    d = DataLayer(str(tmp_path / "speechcoach.db"))
+    yield d
+    d.close()
+
+
+def _children(d):
+    return [r["name"] for r in d.list_children()]
+
+
+def _session_texts(d):
+    rows = d.conn.execute("SELECT id, expected_text FROM sessions ORDER BY id").fetchall()
+    return [(int(r[0]), r[1]) for r in rows]
+
+
+def _round(child_id, n):
+    return {"child_id": child_id, "story_id": "s1", "sentence_index": n, "expected_text": f"phrase {n}", "wer": 0.1 * n}
+
+
+# ---- transaction()
+
+def test_transaction_commits_all_writes(dl):
+    with dl.transaction():
+        dl.add_child("Alice", 7, "F", "CE1")
+        dl.add_child("Bruno", 8, "M", "CE2")
+    assert sorted(_children(dl)) == ["Alice", "Bruno"]
+    assert not dl.conn.in_transaction
+
+
+def test_transaction_rolls_back_on_error(dl):
+    with pytest.raises(RuntimeError):
+        with dl.transaction():
+            dl.add_child("Alice", 7, "F", "CE1")
+            raise RuntimeError("boom")
+    assert _children(dl) == []
+    assert not dl.conn.in_transaction
+    # The connection is usable afterwards.
+    dl.add_child("Bruno", 8, "M", "CE2")
+    assert _children(dl) == ["Bruno"]
+
+
+def test_nested_transaction_commits_with_outer_block(dl):
+    with dl.transaction():
+        dl.add_child("Alice", 7, "F", "CE1")
+        with dl.transaction():
+            dl.add_child("Bruno", 8, "M", "CE2")
+        # The inner block does not commit on its own.
+        assert dl.conn.in_transaction
+    assert sorted(_children(dl)) == ["Alice", "Bruno"]
+
+
+def test_nested_transaction_error_undoes_only_inner_writes(dl):
+    with dl.transaction():
+        dl.add_child("Alice", 7, "F", "CE1")
+        with pytest.raises(RuntimeError):
+            with dl.transaction():
+                dl.add_child("Bruno", 8, "M", "CE2")
+                raise RuntimeError("boom")
+        dl.add_child("Chloé", 6, "F", "CP")
+    assert sorted(_children(dl)) == ["Alice", "Chloé"]
+
+
+def test_nested_transaction_error_propagating_rolls_back_everything(dl):
+    with pytest.raises(RuntimeError):
+        with dl.transaction():
+            dl.add_child("Alice", 7, "F", "CE1")
+            with dl.transaction():
+                dl.add_child("Bruno", 8, "M", "CE2")
+                raise RuntimeError("boom")
+    assert _children(dl) == []
+    assert not dl.conn.in_transaction
+
+
+def test_transaction_is_invisible_to_readers_until_commit(dl, tmp_path):
+    other = sqlite3.connect(str(tmp_path / "speechcoach.db"))
+    try:
+        with dl.transaction():
+            dl.add_child("Alice", 7, "F", "CE1")
+            assert other.execute("SELECT COUNT(*) FROM children").fetchone()[0] == 0
+        assert other.execute("SELECT COUNT(*) FROM children").fetchone()[0] == 1
+    finally:
+        other.close()
+
+
+def test_reads_inside_transaction_see_its_writes(dl):
+    seen_elsewhere = []
+    with dl.transaction():
+        dl.add_child("Alice", 7, "F", "CE1")
+        assert _children(dl) == ["Alice"]
+        # Other threads keep reading committed data from the pool.
+        t = threading.Thread(target=lambda: seen_elsewhere.append(_children(dl)))
+        t.start()
+        t.join(5)
+    assert seen_elsewhere == [[]]
+    assert _children(dl) == ["Alice"]
+
+
+# ---- session batches
+
+def test_save_sessions_returns_ids_of_stored_rows(dl):
+    dl.save_session(_round(1, 0))
+    ids = dl.save_sessions([_round(1, n) for n in range(1, 4)])
+    stored = dict(_session_texts(dl))
+    assert len(ids) == 3
+    assert [stored[i] for i in ids] == ["phrase 1", "phrase 2", "phrase 3"]
+
+
+def test_save_sessions_after_deletes_still_matches(dl):
+    # AUTOINCREMENT never reuses ids: the computed range must follow sqlite_sequence.
+    first = dl.save_sessions([_round(1, n) for n in range(3)])
+    dl.conn.execute("DELETE FROM sessions")
+    dl.conn.commit()
+    ids = dl.save_sessions([_round(1, n) for n in range(3, 5)])
+    assert ids[0] > first[-1]
+    assert _session_texts(dl) == list(zip(ids, ["phrase 3", "phrase 4"]))
+
+
+def test_plan_is_stored_compressed_either_way(dl):
+    from speechcoach.db import _pack_text
+
+    plan_json = '{"name": "Révision", "rounds": 6}'
+    by_text = dl.save_session(dict(_round(1, 0), plan_json=plan_json))
+    by_blob = dl.save_session(dict(_round(1, 1), plan_blob=_pack_text(plan_json)))
+    for sid in (by_text, by_blob):
+        assert dl.get_session_played_plan(sid) == {"name": "Révision", "rounds": 6}
+    stored = dl.conn.execute("SELECT COUNT(*) FROM sessions WHERE plan_json IS NULL AND plan_blob IS NOT NULL").fetchone()[0]
+    assert stored == 2
+
+
+def test_session_batch_buffers_until_flush(dl):
+    batch = dl.session_batch()
+    batch.add(_round(1, 0))
+    batch.add(_round(1, 1))
+    assert _session_texts(dl) == []
+    ids = batch.flush()
+    assert _session_texts(dl) == list(zip(ids, ["phrase 0", "phrase 1"]))
+    assert batch.flush() == []
+
+
+def test_save_session_is_immediate_while_a_batch_is_open(dl):
+    batch = dl.session_batch()
+    batch.add(_round(1, 0))
+    sid = dl.save_session(_round(1, 1))
+    assert sid > 0
+    assert _session_texts(dl) == [(sid, "phrase 1")]
+    batch.close()
+    assert [t for _, t in _session_texts(dl)] == ["phrase 1", "phrase 0"]
+
+
+def test_session_batch_flush_every(dl):
+    with dl.session_batch(flush_every=2) as batch:
+        for n in range(5):
+            batch.add(_round(1, n))
+        assert len(_session_texts(dl)) == 4
+    assert [t for _, t in _session_texts(dl)] == [f"phrase {n}" for n in range(5)]
+
+
+def test_session_batch_context_flushes_on_error(dl):
+    with pytest.raises(RuntimeError):
+        with dl.session_batch() as batch:
+            batch.add(_round(1, 0))
+            raise RuntimeError("boom")
+    assert [t for _, t in _session_texts(dl)] == ["phrase 0"]
+
+
+def test_session_batch_inside_transaction_rolls_back(dl):
+    batch = dl.session_batch()
+    batch.add(_round(1, 0))
+    with pytest.raises(RuntimeError):
+        with dl.transaction():
+            batch.flush()
+            raise RuntimeError("boom")
+    assert _session_texts(dl) == []
+
+
+# ---- GameController._run flushes the batch on errors
+
+class _TTS:
+    def speak(self, text):
+        pass
+
+    def prefetch(self, text):
+        pass
+
+
+class _Audio:
+    sample_rate = 16000
+    input_device = 0
+    tts = _TTS()
+
+    def record_until_silence_rms(self, path, stop_event=None, on_chunk=None):
+        raise RuntimeError("audio device lost")
+
+
+def test_run_flushes_buffered_rounds_after_an_exception(dl, monkeypatch):
+    game = pytest.importorskip("speechcoach.game")
+    from speechcoach.db import SessionBatch
+    from speechcoach.models import Story, StorySentence
+
+    # Rounds already buffered when the device fails mid-run.
+    opened = []
+
+    def _session_batch(flush_every=0):
+        batch = SessionBatch(dl, flush_every)
+        batch.add(_round(1, 0))
+        batch.add(_round(1, 1))
+        opened.append(batch)
+        return batch
+
+    monkeypatch.setattr(dl, "session_batch", _session_batch)
+    ctrl = game.GameController(stories=None, audio=_Audio(), asr=None, dl=dl, ui_dispatch=lambda fn: fn())
+    ctrl.set_child(1)
+    ctrl.on_sentence = lambda *args: None
+
+    story = Story(story_id="s1", title="Test", sentences=[StorySentence(text="phrase")])
+    worker = threading.Thread(target=ctrl._run, args=(story, 2))
+    worker.start()
+    worker.join(10)
+
+    assert ctrl.last_end_reason == "error"
+    assert len(opened) == 1
+    assert [t for _, t in _session_texts(dl)] == ["phrase 0", "phrase 1"]
@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from speechcoach.utils_features import FEATURES_BLOB_VERSION, pack_features, unpack_features
+
+
+def _roundtrip(feat):
+    return unpack_features(pack_features(feat))
+
+
+def test_roundtrip_full_features():
+    feat = {
+        "mfcc_mean": [-312.5, 48.25, -7.125, 0.0, 3.5],
+        "zcr": 0.0625,
+        "rms": 0.03125,
+        "centroid": 2150.5,
+        "rolloff": 4410.0,
+        "sr": 16000,
+        "dur_sec": 1.75,
+    }
+    out = _roundtrip(feat)
+    assert out == feat
+    assert isinstance(out["sr"], int)
+
+
+def test_roundtrip_is_float32_precise():
+    feat = {"mfcc_mean": [0.1, -1.0 / 3.0], "rms": 0.012345678, "centroid": 1234.5678}
+    out = _roundtrip(feat)
+    assert out["mfcc_mean"] == pytest.approx(feat["mfcc_mean"], rel=1e-6)
+    assert out["rms"] == pytest.approx(feat["rms"], rel=1e-6)
+    assert out["centroid"] == pytest.approx(feat["centroid"], rel=1e-6)
+
+
+def test_missing_scalars_stay_missing():
+    feat = {"mfcc_mean": [1.0, 2.0], "rms": 0.5, "sr": None}
+    out = _roundtrip(feat)
+    assert out == {"mfcc_mean": [1.0, 2.0], "rms": 0.5}
+    assert not any(isinstance(v, float) and math.isnan(v) for v in out.values())
+
+
+def test_empty_mfcc_mean():
+    feat = {"mfcc_mean": [], "zcr": 0.25, "dur_sec": 2.0}
+    assert _roundtrip(feat) == feat
+
+
+def test_no_mfcc_key_decodes_as_empty_list():
+    assert _roundtrip({"rms": 0.5}) == {"mfcc_mean": [], "rms": 0.5}
+
+
+def test_empty_input():
+    assert pack_features(None) is None
+    assert pack_features({}) is None
+    assert unpack_features(None) == {}
+    assert unpack_features(b"") == {}
+
+
+def test_invalid_blobs_decode_to_empty_dict():
+    blob = pack_features({"mfcc_mean": [1.0, 2.0], "rms": 0.5})
+    assert unpack_features(bytes([FEATURES_BLOB_VERSION + 1]) + blob[1:]) == {}
+    assert unpack_features(blob[:-1]) == {}
+    assert unpack_features(blob[:1]) == {}